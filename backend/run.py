@@ -1,12 +1,31 @@
 """Entry point for running the backend server."""
+import os
 import uvicorn
 from src.config import get_settings
+from src.db.database import engine, init_db
 
 if __name__ == "__main__":
     settings = get_settings()
-    uvicorn.run(
-        "src.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=True,
-    )
+
+    # Migrate once before starting workers; each worker running the DDL
+    # at startup would race the others
+    init_db()
+    engine.dispose()
+    os.environ["INIT_DB_ON_STARTUP"] = "false"
+
+    if settings.environment == "production":
+        uvicorn.run(
+            "src.main:app",
+            host=settings.host,
+            port=settings.port,
+            loop="uvloop",
+            http="httptools",
+            workers=settings.workers or os.cpu_count(),
+        )
+    else:
+        uvicorn.run(
+            "src.main:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+        )
@@ -1,42 +1,87 @@
 """API routes."""
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Optional
-import uuid
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, func
+from sqlalchemy.orm import load_only, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+import hmac
+import secrets
 from datetime import datetime
 import asyncio
 
-from ..db.database import get_db
+from ..config import get_settings
+from ..db.database import get_db, AsyncSessionLocal
 from ..models import Generation, GenerationStatus, APIKey, KeyStatus
+from ..models.generation import to_unix_timestamp
+from ..services.cache import (
+    get_cache_service,
+    detailed_usage_cache_key,
+    generation_progress_key,
+    PROVIDERS_CACHE_KEY,
+    USAGE_STATS_CACHE_KEY,
+)
+from ..services.cost_calculator import estimate_cost, get_formatted_pricing
+from ..services.generation_batcher import get_generation_batcher
 from ..services.key_manager import get_key_manager
 from ..services.video_storage import get_video_storage
-from ..providers import create_provider, get_provider_for_model, PROVIDERS, VideoRequest
+from ..providers import (
+    create_provider,
+    get_provider_for_model,
+    PROVIDERS,
+    PROVIDER_META,
+)
+from ..workers.video import ACTIVE_STATUSES, finalize_video_generation, webhook_token
 from .schemas import (
     VideoGenerationRequest,
     VideoGenerationResponse,
+    ParametersObject,
     APIKeyRequest,
     APIKeyResponse,
     ProviderInfo,
-    UsageStatsResponse,
 )
 
 router = APIRouter()
 
+# Columns serialized by Generation.to_dict(); listings skip the rest
+GENERATION_RESPONSE_COLUMNS = (
+    Generation.id,
+    Generation.provider,
+    Generation.model,
+    Generation.prompt,
+    Generation.duration,
+    Generation.aspect_ratio,
+    Generation.seed,
+    Generation.fps,
+    Generation.video_url,
+    Generation.status,
+    Generation.error_message,
+    Generation.cost,
+    Generation.duration_seconds,
+    Generation.generation_time,
+    Generation.width,
+    Generation.height,
+    Generation.created_at,
+    Generation.completed_at,
+)
+
 
 # Video Generation Routes
-@router.post("/v1/video/generations", response_model=VideoGenerationResponse)
+@router.post("/v1/video/generations", response_model=VideoGenerationResponse, status_code=202)
 async def create_video_generation(
     request: VideoGenerationRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Create a new video generation."""
+    """Create a new video generation.
+
+    Returns 202 once the job is queued; poll the generation for progress.
+    """
     # Determine provider
     provider_name = request.provider or get_provider_for_model(request.model)
 
     # Get API key
     key_manager = get_key_manager()
-    api_key = key_manager.get_key_by_provider(db, provider_name)
+    api_key = await key_manager.get_key_by_provider(db, provider_name)
 
     if not api_key or api_key.status != KeyStatus.ACTIVE:
         raise HTTPException(
@@ -44,93 +89,127 @@ async def create_video_generation(
             detail=f"No active API key found for provider: {provider_name}",
         )
 
-    # Create generation record
-    generation_id = f"gen_{uuid.uuid4().hex[:12]}"
-    generation = Generation(
-        id=generation_id,
-        provider=provider_name,
-        model=request.model,
-        prompt=request.prompt,
-        parameters={
+    # Create generation record and queue it on the worker pool; concurrent
+    # submissions are inserted and enqueued together
+    generation_id = f"gen_{secrets.token_hex(6)}"
+    created_at = datetime.utcnow()
+    await get_generation_batcher().submit(
+        {
+            "id": generation_id,
+            "provider": provider_name,
+            "model": request.model,
+            "prompt": request.prompt,
             "duration": request.duration,
             "aspect_ratio": request.aspect_ratio,
             "seed": request.seed,
             "fps": request.fps,
+            "status": GenerationStatus.QUEUED.value,
+            "created_at": created_at,
+            "updated_at": created_at,
         },
-        status=GenerationStatus.QUEUED,
+        (generation_id, provider_name, api_key.id, request.model_dump()),
     )
 
-    db.add(generation)
-    db.commit()
-    db.refresh(generation)
-
-    # Start background task to generate video
-    background_tasks.add_task(
-        process_video_generation,
-        generation_id,
-        provider_name,
-        key_manager.decrypt_key(api_key),
-        request,
+    # Every field is known locally, so skip reloading the row
+    return VideoGenerationResponse(
+        id=generation_id,
+        created=to_unix_timestamp(created_at),
+        model=request.model,
+        provider=provider_name,
+        status=GenerationStatus.QUEUED.value,
+        prompt=request.prompt,
+        parameters=ParametersObject(
+            duration=request.duration,
+            aspect_ratio=request.aspect_ratio,
+            seed=request.seed,
+            fps=request.fps,
+        ),
     )
 
-    return VideoGenerationResponse(**generation.to_dict())
-
 
 @router.get("/v1/video/generations/{generation_id}", response_model=VideoGenerationResponse)
-def get_video_generation(
+async def get_video_generation(
     generation_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get video generation status."""
-    generation = db.query(Generation).filter(Generation.id == generation_id).first()
+    generation = await db.get(Generation, generation_id)
 
     if not generation:
         raise HTTPException(status_code=404, detail="Generation not found")
 
-    return VideoGenerationResponse(**generation.to_dict())
+    response = VideoGenerationResponse.model_validate(generation)
+    if generation.status == GenerationStatus.PROCESSING:
+        # Polling progress is only tracked in Redis
+        response.progress = await get_cache_service().get(generation_progress_key(generation_id))
+    return response
 
 
 @router.get("/v1/video/generations", response_model=List[VideoGenerationResponse])
-def list_video_generations(
-    skip: int = 0,
-    limit: int = 50,
+async def list_video_generations(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    before: Optional[datetime] = None,
     provider: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """List video generations."""
-    query = db.query(Generation)
+    """List video generations.
+
+    For deep pagination pass the `X-Next-Before` response header back as
+    `before`, which seeks on created_at instead of scanning `skip` rows.
+
+    Rows are encoded straight from to_dict() with orjson, skipping
+    per-row Pydantic validation; response_model only documents the shape.
+    """
+    query = select(Generation).options(
+        load_only(*GENERATION_RESPONSE_COLUMNS, raiseload=True),
+        raiseload("*"),
+    )
 
     if provider:
-        query = query.filter(Generation.provider == provider)
+        query = query.where(Generation.provider == provider)
     if status:
-        query = query.filter(Generation.status == status)
+        query = query.where(Generation.status == status)
+    if before:
+        query = query.where(Generation.created_at < before)
+
+    result = await db.execute(
+        query.order_by(Generation.created_at.desc()).offset(skip).limit(limit)
+    )
+    generations = result.scalars().all()
 
-    generations = query.order_by(Generation.created_at.desc()).offset(skip).limit(limit).all()
+    headers = {}
+    if len(generations) == limit:
+        headers["X-Next-Before"] = generations[-1].created_at.isoformat()
 
-    return [VideoGenerationResponse(**g.to_dict()) for g in generations]
+    return ORJSONResponse([g.to_dict() for g in generations], headers=headers)
 
 
 @router.delete("/v1/video/generations/{generation_id}")
-def delete_video_generation(
+async def delete_video_generation(
     generation_id: str,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete a video generation."""
-    generation = db.query(Generation).filter(Generation.id == generation_id).first()
+    generation = await db.get(Generation, generation_id)
 
     if not generation:
         raise HTTPException(status_code=404, detail="Generation not found")
 
-    # Delete video file
-    if generation.video_path:
-        storage = get_video_storage()
-        filename = generation.video_path.split("/")[-1]
-        storage.delete_video(filename)
+    video_path = generation.video_path
 
     # Delete record
-    db.delete(generation)
-    db.commit()
+    await db.delete(generation)
+    await db.commit()
+    await get_cache_service().delete(USAGE_STATS_CACHE_KEY)
+
+    # Delete video file after responding; a crash leaves an orphan file, never a dangling row
+    if video_path:
+        storage = get_video_storage()
+        filename = video_path.split("/")[-1]
+        background_tasks.add_task(storage.delete_video, filename)
 
     return {"message": "Generation deleted successfully"}
 
@@ -139,7 +218,7 @@ def delete_video_generation(
 @router.post("/v1/keys", response_model=APIKeyResponse)
 async def add_api_key(
     request: APIKeyRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Add a new API key."""
     if request.provider not in PROVIDERS:
@@ -166,44 +245,46 @@ async def add_api_key(
 
     # Store key
     key_manager = get_key_manager()
-    api_key = key_manager.add_key(db, request.provider, request.api_key)
+    api_key = await key_manager.add_key(db, request.provider, request.api_key)
     api_key.last_validated = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    await get_cache_service().delete(PROVIDERS_CACHE_KEY)
 
     return APIKeyResponse(**api_key.to_dict(include_key=True))
 
 
 @router.get("/v1/keys", response_model=List[APIKeyResponse])
-def list_api_keys(db: Session = Depends(get_db)):
+async def list_api_keys(db: AsyncSession = Depends(get_db)):
     """List all API keys."""
     key_manager = get_key_manager()
-    keys = key_manager.list_keys(db)
+    keys = await key_manager.list_keys(db)
     return [APIKeyResponse(**k.to_dict(include_key=True)) for k in keys]
 
 
 @router.delete("/v1/keys/{key_id}")
-def delete_api_key(
+async def delete_api_key(
     key_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete an API key."""
     key_manager = get_key_manager()
-    success = key_manager.delete_key(db, key_id)
+    success = await key_manager.delete_key(db, key_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Key not found")
 
+    await get_cache_service().delete(PROVIDERS_CACHE_KEY)
     return {"message": "Key deleted successfully"}
 
 
 @router.post("/v1/keys/{key_id}/validate")
 async def validate_api_key(
     key_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Validate an API key."""
     key_manager = get_key_manager()
-    api_key = key_manager.get_key(db, key_id)
+    api_key = await key_manager.get_key(db, key_id)
 
     if not api_key:
         raise HTTPException(status_code=404, detail="Key not found")
@@ -213,122 +294,178 @@ async def validate_api_key(
         is_valid = await provider.validate_key()
 
         status = KeyStatus.ACTIVE if is_valid else KeyStatus.INVALID
-        key_manager.update_key_status(db, key_id, status)
+        await key_manager.update_key_status(db, key_id, status)
+        await get_cache_service().delete(PROVIDERS_CACHE_KEY)
 
         return {"valid": is_valid, "status": status.value}
     except Exception as e:
-        key_manager.update_key_status(db, key_id, KeyStatus.INVALID)
+        await key_manager.update_key_status(db, key_id, KeyStatus.INVALID)
+        await get_cache_service().delete(PROVIDERS_CACHE_KEY)
         return {"valid": False, "status": "invalid", "error": str(e)}
 
 
 # Provider Routes
 @router.get("/v1/providers", response_model=List[ProviderInfo])
-def list_providers(db: Session = Depends(get_db)):
+async def list_providers(db: AsyncSession = Depends(get_db)):
     """List all available providers."""
+    cache = get_cache_service()
+    cached = await cache.get(PROVIDERS_CACHE_KEY)
+    if cached is not None:
+        return [ProviderInfo(**p) for p in cached]
+
     key_manager = get_key_manager()
-    provider_keys = {k.provider: k for k in key_manager.list_keys(db)}
+    provider_keys = {k.provider: k for k in await key_manager.list_keys(db)}
 
     provider_info = []
-    for name, provider_class in PROVIDERS.items():
-        # Create temporary instance to get features
-        temp_provider = provider_class(api_key="dummy")
-        features = temp_provider.get_supported_features()
-
+    for name, meta in PROVIDER_META.items():
         api_key = provider_keys.get(name)
 
         info = ProviderInfo(
             name=name,
             display_name=name.title(),
-            models=temp_provider.models,
-            features=features.dict(),
+            models=meta["models"],
+            features=meta["features"],
             has_key=api_key is not None,
             key_status=api_key.status.value if api_key else None,
         )
         provider_info.append(info)
 
+    await cache.set(
+        PROVIDERS_CACHE_KEY,
+        [p.model_dump() for p in provider_info],
+        get_settings().providers_cache_ttl,
+    )
     return provider_info
 
 
+# Webhook Routes
+@router.post("/v1/webhooks/{provider_name}/{generation_id}")
+async def receive_provider_webhook(
+    provider_name: str,
+    generation_id: str,
+    payload: Dict[str, Any],
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """Receive a provider completion webhook.
+
+    The URL carries a token signed for the generation, so only the provider
+    we registered it with can call it. The payload only identifies the job;
+    the worker re-checks its status with the provider before downloading.
+    """
+    # Bytes, since compare_digest rejects non-ASCII str
+    if not hmac.compare_digest(token.encode(), webhook_token(generation_id).encode()):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+
+    provider_class = PROVIDERS.get(provider_name)
+    if not provider_class:
+        raise HTTPException(status_code=404, detail=f"Unknown provider: {provider_name}")
+
+    job_id = provider_class(api_key="dummy").get_webhook_job_id(payload)
+    if not job_id:
+        raise HTTPException(status_code=400, detail="Webhook payload has no job ID")
+
+    generation = await db.get(Generation, generation_id)
+    if (
+        not generation
+        or generation.provider != provider_name
+        or generation.provider_job_id != job_id
+    ):
+        raise HTTPException(status_code=404, detail="Generation not found")
+
+    if generation.status in ACTIVE_STATUSES:
+        key_manager = get_key_manager()
+        api_key = await key_manager.get_key_by_provider(db, provider_name)
+
+        if not api_key:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No active API key found for provider: {provider_name}",
+            )
+
+        finalize_video_generation.delay(generation.id, provider_name, api_key.id)
+
+    return {"received": True}
+
+
 # Usage Statistics Routes
-@router.get("/v1/usage/stats", response_model=UsageStatsResponse)
-def get_usage_stats(db: Session = Depends(get_db)):
-    """Get usage statistics."""
-    from sqlalchemy import func
-
-    # Total stats
-    total_generations = db.query(func.count(Generation.id)).scalar() or 0
-    total_cost = db.query(func.sum(Generation.cost)).scalar() or 0.0
-    total_success = (
-        db.query(func.count(Generation.id))
-        .filter(Generation.status == GenerationStatus.COMPLETED)
-        .scalar()
-        or 0
-    )
-    total_failure = (
-        db.query(func.count(Generation.id))
-        .filter(Generation.status == GenerationStatus.FAILED)
-        .scalar()
-        or 0
+@router.get("/v1/usage/stats")
+async def get_usage_stats(db: AsyncSession = Depends(get_db)):
+    """Get usage statistics.
+
+    Returns a plain dict (shaped like UsageStatsResponse) so cached and
+    aggregated rows go straight to the JSON encoder without re-validation.
+    """
+    cache = get_cache_service()
+    cached = await cache.get(USAGE_STATS_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    # Total stats (single scan)
+    totals_query = select(
+        func.count(Generation.id),
+        func.coalesce(func.sum(Generation.cost), 0.0),
+        func.count(Generation.id).filter(Generation.status == GenerationStatus.COMPLETED),
+        func.count(Generation.id).filter(Generation.status == GenerationStatus.FAILED),
     )
 
     # By provider
-    by_provider = (
-        db.query(
+    by_provider_query = (
+        select(
             Generation.provider,
             func.count(Generation.id).label("count"),
-            func.sum(Generation.cost).label("total_cost"),
-            func.avg(Generation.generation_time).label("avg_time"),
+            func.coalesce(func.sum(Generation.cost), 0.0).label("total_cost"),
+            func.coalesce(func.avg(Generation.generation_time), 0.0).label("avg_time"),
         )
         .group_by(Generation.provider)
-        .all()
     )
 
     # By model
-    by_model = (
-        db.query(
+    by_model_query = (
+        select(
             Generation.model,
             func.count(Generation.id).label("count"),
-            func.sum(Generation.cost).label("total_cost"),
-            func.avg(Generation.generation_time).label("avg_time"),
+            func.coalesce(func.sum(Generation.cost), 0.0).label("total_cost"),
+            func.coalesce(func.avg(Generation.generation_time), 0.0).label("avg_time"),
         )
         .group_by(Generation.model)
-        .all()
     )
 
     # Recent generations
-    recent = (
-        db.query(Generation)
-        .order_by(Generation.created_at.desc())
-        .limit(10)
-        .all()
+    recent_query = select(Generation).order_by(Generation.created_at.desc()).limit(10)
+
+    # A session can't run statements concurrently, so the breakdowns use their own
+    totals, by_provider, by_model, recent = await asyncio.gather(
+        db.execute(totals_query),
+        _fetch_in_new_session(by_provider_query),
+        _fetch_in_new_session(by_model_query),
+        _fetch_in_new_session(recent_query, scalars=True),
     )
+    total_generations, total_cost, total_success, total_failure = totals.one()
+
+    stats = {
+        "total_generations": total_generations,
+        "total_cost": total_cost,
+        "total_success": total_success,
+        "total_failure": total_failure,
+        "success_rate": total_success / total_generations if total_generations > 0 else 0,
+        "by_provider": [dict(row) for row in by_provider],
+        "by_model": [dict(row) for row in by_model],
+        "recent_generations": [g.to_dict() for g in recent],
+    }
 
-    return UsageStatsResponse(
-        total_generations=total_generations,
-        total_cost=total_cost,
-        total_success=total_success,
-        total_failure=total_failure,
-        success_rate=total_success / total_generations if total_generations > 0 else 0,
-        by_provider=[
-            {
-                "provider": p.provider,
-                "count": p.count,
-                "total_cost": p.total_cost or 0.0,
-                "avg_time": p.avg_time or 0.0,
-            }
-            for p in by_provider
-        ],
-        by_model=[
-            {
-                "model": m.model,
-                "count": m.count,
-                "total_cost": m.total_cost or 0.0,
-                "avg_time": m.avg_time or 0.0,
-            }
-            for m in by_model
-        ],
-        recent_generations=[VideoGenerationResponse(**g.to_dict()) for g in recent],
-    )
+    await cache.set(USAGE_STATS_CACHE_KEY, stats, get_settings().usage_stats_cache_ttl)
+    return stats
+
+
+async def _fetch_in_new_session(query, scalars: bool = False) -> list:
+    """Run a read query in its own session so it can overlap with others.
+
+    Returns ORM objects when scalars is set, otherwise row mappings.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query)
+        return list(result.scalars().all() if scalars else result.mappings().all())
 
 
 @router.post("/v1/usage/estimate")
@@ -337,13 +474,8 @@ async def estimate_generation_cost(request: VideoGenerationRequest):
 
     Returns cost breakdown and pricing info.
     """
-    from ..services.cost_calculator import get_cost_calculator
-    from ..providers import get_provider_for_model
-
     provider_name = request.provider or get_provider_for_model(request.model)
-    cost_calc = get_cost_calculator()
-
-    estimate = cost_calc.estimate_cost(
+    estimate = estimate_cost(
         provider=provider_name,
         model=request.model,
         duration_seconds=request.duration or 5,
@@ -360,11 +492,11 @@ async def estimate_generation_cost(request: VideoGenerationRequest):
 
 
 @router.get("/v1/usage/detailed")
-def get_detailed_usage(
+async def get_detailed_usage(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     provider: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get detailed usage statistics with date filtering.
 
@@ -373,263 +505,112 @@ def get_detailed_usage(
     - end_date: ISO format (YYYY-MM-DD)
     - provider: Filter by provider
     """
-    from datetime import datetime as dt
-    from sqlalchemy import func, and_
-
-    query = db.query(Generation)
+    cache = get_cache_service()
+    cache_key = detailed_usage_cache_key(start_date, end_date, provider)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    # Apply filters
+    # Apply filters (unparseable dates are ignored)
     filters = []
-    if start_date:
-        try:
-            start_dt = dt.fromisoformat(start_date)
-            filters.append(Generation.created_at >= start_dt)
-        except:
-            pass
-
-    if end_date:
-        try:
-            end_dt = dt.fromisoformat(end_date)
-            filters.append(Generation.created_at <= end_dt)
-        except:
-            pass
+    start_dt = _parse_iso_datetime(start_date) if start_date else None
+    if start_dt:
+        filters.append(Generation.created_at >= start_dt)
+
+    end_dt = _parse_iso_datetime(end_date) if end_date else None
+    if end_dt:
+        filters.append(Generation.created_at <= end_dt)
 
     if provider:
         filters.append(Generation.provider == provider)
 
-    if filters:
-        query = query.filter(and_(*filters))
-
-    # Get all generations
-    generations = query.all()
-
-    # Calculate totals
-    total_cost = sum(g.cost or 0.0 for g in generations)
-    total_duration = sum(g.duration_seconds or 0.0 for g in generations)
-    total_generation_time = sum(g.generation_time or 0.0 for g in generations)
+    # Totals
+    totals_query = select(
+        func.count(Generation.id),
+        func.coalesce(func.sum(Generation.cost), 0.0),
+        func.coalesce(func.sum(Generation.duration_seconds), 0.0),
+        func.coalesce(func.sum(Generation.generation_time), 0.0),
+    ).where(*filters)
 
     # Group by date
-    daily_stats = {}
-    for gen in generations:
-        date_key = gen.created_at.date().isoformat()
-        if date_key not in daily_stats:
-            daily_stats[date_key] = {
-                "date": date_key,
-                "count": 0,
-                "cost": 0.0,
-                "duration": 0.0,
-                "success": 0,
-                "failed": 0,
-            }
-
-        daily_stats[date_key]["count"] += 1
-        daily_stats[date_key]["cost"] += gen.cost or 0.0
-        daily_stats[date_key]["duration"] += gen.duration_seconds or 0.0
-
-        if gen.status == GenerationStatus.COMPLETED:
-            daily_stats[date_key]["success"] += 1
-        elif gen.status == GenerationStatus.FAILED:
-            daily_stats[date_key]["failed"] += 1
+    day = func.date(Generation.created_at)
+    daily_query = (
+        select(
+            day.label("date"),
+            func.count(Generation.id).label("count"),
+            func.coalesce(func.sum(Generation.cost), 0.0).label("cost"),
+            func.coalesce(func.sum(Generation.duration_seconds), 0.0).label("duration"),
+            func.count(Generation.id).filter(Generation.status == GenerationStatus.COMPLETED).label("success"),
+            func.count(Generation.id).filter(Generation.status == GenerationStatus.FAILED).label("failed"),
+        )
+        .where(*filters)
+        .group_by(day)
+        .order_by(day)
+    )
 
     # Group by provider
-    provider_stats = {}
-    for gen in generations:
-        prov = gen.provider
-        if prov not in provider_stats:
-            provider_stats[prov] = {
-                "provider": prov,
-                "count": 0,
-                "cost": 0.0,
-                "duration": 0.0,
-                "avg_cost_per_second": 0.0,
-            }
-
-        provider_stats[prov]["count"] += 1
-        provider_stats[prov]["cost"] += gen.cost or 0.0
-        provider_stats[prov]["duration"] += gen.duration_seconds or 0.0
-
-    # Calculate averages
-    for prov_data in provider_stats.values():
-        if prov_data["duration"] > 0:
-            prov_data["avg_cost_per_second"] = prov_data["cost"] / prov_data["duration"]
+    provider_query = (
+        select(
+            Generation.provider,
+            func.count(Generation.id).label("count"),
+            func.coalesce(func.sum(Generation.cost), 0.0).label("cost"),
+            func.coalesce(func.sum(Generation.duration_seconds), 0.0).label("duration"),
+        )
+        .where(*filters)
+        .group_by(Generation.provider)
+    )
 
-    return {
+    totals, daily, by_provider = await asyncio.gather(
+        db.execute(totals_query),
+        _fetch_in_new_session(daily_query),
+        _fetch_in_new_session(provider_query),
+    )
+    total_generations, total_cost, total_duration, total_generation_time = totals.one()
+
+    # SQLite returns dates as strings, Postgres as date objects
+    daily_stats = [{**row, "date": str(row["date"])} for row in daily]
+
+    provider_stats = [
+        {
+            **row,
+            "avg_cost_per_second": row["cost"] / row["duration"] if row["duration"] > 0 else 0.0,
+        }
+        for row in by_provider
+    ]
+
+    usage = {
         "summary": {
-            "total_generations": len(generations),
+            "total_generations": total_generations,
             "total_cost": round(total_cost, 2),
             "total_video_duration": round(total_duration, 1),
             "total_processing_time": round(total_generation_time, 1),
-            "average_cost_per_generation": round(total_cost / len(generations), 4) if generations else 0,
+            "average_cost_per_generation": round(total_cost / total_generations, 4) if total_generations else 0,
         },
-        "daily": sorted(daily_stats.values(), key=lambda x: x["date"]),
-        "by_provider": list(provider_stats.values()),
+        "daily": daily_stats,
+        "by_provider": provider_stats,
         "date_range": {
             "start": start_date,
             "end": end_date,
         },
     }
 
+    await cache.set(cache_key, usage, get_settings().usage_stats_cache_ttl)
+    return usage
+
+
+def _parse_iso_datetime(value: str) -> Optional[datetime]:
+    """Parse an ISO 8601 date or datetime, or None if it is malformed."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
 
 @router.get("/v1/usage/pricing")
 def get_pricing_info():
     """Get pricing information for all providers and models."""
-    from ..services.cost_calculator import get_cost_calculator
-
-    cost_calc = get_cost_calculator()
-    pricing = cost_calc.get_pricing_info()
-
-    # Format for frontend
-    formatted = []
-    for provider, models in pricing.items():
-        for model, rates in models.items():
-            formatted.append({
-                "provider": provider,
-                "model": model,
-                "per_second": rates["per_second"],
-                "base_cost": rates["base_cost"],
-                "currency": "USD",
-                "examples": {
-                    "5_seconds": round(rates["per_second"] * 5, 2),
-                    "10_seconds": round(rates["per_second"] * 10, 2),
-                    "20_seconds": round(rates["per_second"] * 20, 2),
-                },
-            })
-
     return {
-        "pricing": formatted,
+        "pricing": get_formatted_pricing(),
         "last_updated": "2025-10-07",
         "note": "Prices are estimates. Actual costs may vary.",
     }
-
-
-# Background task for video generation
-async def process_video_generation(
-    generation_id: str,
-    provider_name: str,
-    api_key: str,
-    request: VideoGenerationRequest,
-):
-    """Process video generation in background."""
-    from ..db.database import SessionLocal
-
-    db = SessionLocal()
-    try:
-        generation = db.query(Generation).filter(Generation.id == generation_id).first()
-        if not generation:
-            return
-
-        # Update status to processing
-        generation.status = GenerationStatus.PROCESSING
-        db.commit()
-
-        # Create provider
-        provider = create_provider(provider_name, api_key)
-
-        # Generate video
-        video_request = VideoRequest(
-            prompt=request.prompt,
-            duration=request.duration,
-            aspect_ratio=request.aspect_ratio,
-            seed=request.seed,
-            fps=request.fps,
-        )
-
-        start_time = datetime.utcnow()
-        result = await provider.generate_video(video_request)
-
-        if result.status == "failed":
-            generation.status = GenerationStatus.FAILED
-            generation.error_message = result.error
-            db.commit()
-            return
-
-        # Poll for completion
-        max_attempts = 60  # 5 minutes with 5-second intervals
-        for _ in range(max_attempts):
-            await asyncio.sleep(5)
-            status = await provider.check_status(result.job_id)
-
-            if status.status == "completed":
-                # Download video
-                if status.video_url:
-                    storage = get_video_storage()
-                    filename = f"{generation_id}.mp4"
-
-                    # For OpenAI, we need to pass the Authorization header
-                    headers = None
-                    if provider_name == "openai":
-                        headers = {"Authorization": f"Bearer {api_key}"}
-
-                    video_path = await storage.download_video(
-                        status.video_url,
-                        filename,
-                        headers=headers
-                    )
-
-                    # Update generation
-                    end_time = datetime.utcnow()
-                    generation.status = GenerationStatus.COMPLETED
-                    generation.video_url = f"http://localhost:3001{video_path}"
-                    generation.video_path = video_path
-                    generation.generation_time = (end_time - start_time).total_seconds()
-                    generation.completed_at = end_time
-
-                    # Extract metadata if available
-                    if status.metadata:
-                        # Parse size from metadata (e.g., "1280x720")
-                        size = status.metadata.get("size", "1280x720")
-                        if "x" in str(size):
-                            try:
-                                width, height = map(int, str(size).split("x"))
-                                generation.width = width
-                                generation.height = height
-                            except:
-                                generation.width = 1920
-                                generation.height = 1080
-                        else:
-                            generation.width = 1920
-                            generation.height = 1080
-
-                        # Get duration from metadata or use requested duration
-                        duration_str = status.metadata.get("seconds", str(request.duration))
-                        try:
-                            generation.duration_seconds = float(duration_str)
-                        except:
-                            generation.duration_seconds = request.duration
-
-                    # Calculate cost using the cost calculator
-                    from ..services.cost_calculator import get_cost_calculator
-                    cost_calc = get_cost_calculator()
-
-                    resolution = f"{generation.width}x{generation.height}" if generation.width else None
-                    calculated_cost = cost_calc.calculate_cost(
-                        provider=provider_name,
-                        model=request.model,
-                        duration_seconds=generation.duration_seconds or request.duration,
-                        resolution=resolution
-                    )
-                    generation.cost = calculated_cost
-
-                    db.commit()
-                break
-
-            elif status.status == "failed":
-                generation.status = GenerationStatus.FAILED
-                generation.error_message = status.error
-                db.commit()
-                break
-
-        else:
-            # Timeout
-            generation.status = GenerationStatus.FAILED
-            generation.error_message = "Generation timeout"
-            db.commit()
-
-    except Exception as e:
-        generation = db.query(Generation).filter(Generation.id == generation_id).first()
-        if generation:
-            generation.status = GenerationStatus.FAILED
-            generation.error_message = str(e)
-            db.commit()
-    finally:
-        db.close()
@@ -1,5 +1,5 @@
 """API request/response schemas."""
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -16,6 +16,15 @@ class VideoGenerationRequest(BaseModel):
     fps: Optional[int] = Field(None, description="Frames per second")
 
 
+class ParametersObject(BaseModel):
+    """Request parameters of a generation."""
+
+    duration: Optional[int] = None
+    aspect_ratio: Optional[str] = None
+    seed: Optional[int] = None
+    fps: Optional[int] = None
+
+
 class VideoObject(BaseModel):
     """Video object in response."""
 
@@ -33,7 +42,13 @@ class UsageObject(BaseModel):
 
 
 class VideoGenerationResponse(BaseModel):
-    """Video generation response schema."""
+    """Video generation response schema.
+
+    Validates straight from a Generation row via model_validate.
+    Generation.to_dict() builds the same shape for orjson listings.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
 
     id: str
     object: str = "video.generation"
@@ -42,10 +57,12 @@ class VideoGenerationResponse(BaseModel):
     provider: str
     status: str
     prompt: Optional[str] = None
+    parameters: Optional[ParametersObject] = None
     video: Optional[VideoObject] = None
     usage: Optional[UsageObject] = None
-    error: Optional[str] = None
-    completed_at: Optional[str] = None
+    error: Optional[str] = Field(None, validation_alias=AliasChoices("error", "error_message"))
+    completed_at: Optional[datetime] = None
+    progress: Optional[Dict[str, Any]] = None
 
 
 class APIKeyRequest(BaseModel):
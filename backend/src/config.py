@@ -2,7 +2,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 from functools import lru_cache
-from typing import Union
+from typing import Optional, Union
 
 
 class Settings(BaseSettings):
@@ -10,15 +10,25 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./storage/db.sqlite"
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
 
     # Storage
     storage_path: str = "./storage/videos"
     temp_path: str = "./storage/temp"
+    max_concurrent_downloads: int = 8  # Per process
 
     # Server
+    environment: str = "development"
+    workers: Optional[int] = None  # Defaults to CPU count in production
+    init_db_on_startup: bool = True  # run.py migrates before starting workers
     port: int = 3001
     host: str = "0.0.0.0"
     frontend_url: str = "http://localhost:3000"
+    # Public base URL providers can reach for webhooks (disabled if unset)
+    webhook_base_url: Optional[str] = None
 
     # Security
     encryption_key: str = "change-this-encryption-key"
@@ -26,6 +36,10 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    api_key_cache_ttl: int = 300
+    api_key_local_cache_ttl: int = 30
+    providers_cache_ttl: int = 300
+    usage_stats_cache_ttl: int = 60
 
     # CORS
     cors_origins: Union[list[str], str] = "http://localhost:3000,http://localhost:5173"
@@ -43,7 +57,7 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
@@ -1,34 +1,200 @@
 """Database setup and session management."""
-from sqlalchemy import create_engine
+import base64
+import json
+from sqlalchemy import Enum, LargeBinary, create_engine, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from ..config import get_settings
 
 settings = get_settings()
 
-# Create engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+# Indexes from earlier releases that the models no longer define; a
+# composite index (or the primary key) now covers their queries
+DROPPED_INDEXES = (
+    "ix_generations_id",
+    "ix_generations_provider",
+    "ix_generations_created_at",
+    "ix_gen_created_at",
+    "ix_gen_provider_status",
+    "ix_gen_finished_status",
+    "ix_api_keys_provider",
+    "ix_usage_stats_provider",
+    "ix_usage_stats_model",
+)
+
+# Async drivers for each supported database backend, keyed by the sync
+# URL scheme with or without its (default) sync driver
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Convert a sync database URL to its async driver equivalent."""
+    scheme, sep, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_engine_options(database_url: str) -> dict:
+    """Get connection pool options for a database URL."""
+    if "sqlite" in database_url:
+        # SQLite uses local file handles, so only same-thread checks apply
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": True,
+        # Reuse the most recent connection so idle extras age out of the pool
+        "pool_use_lifo": True,
+    }
+
+
+def get_async_engine_options(database_url: str) -> dict:
+    """Get async engine options, including driver-specific connect args."""
+    options = get_engine_options(database_url)
+    if get_async_database_url(database_url).startswith("postgresql+asyncpg"):
+        # Queries here are small; JIT compilation only adds startup latency
+        options["connect_args"] = {"server_settings": {"jit": "off"}}
+    return options
+
+
+# Create engine (used for schema creation)
+engine = create_engine(settings.database_url, **get_engine_options(settings.database_url))
+
+# Create async engine (used by API request handlers and workers)
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    **get_async_engine_options(settings.database_url),
 )
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """Dependency for getting database session."""
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def init_db():
     """Initialize database tables."""
     from ..models import api_key, generation, usage_stat
     Base.metadata.create_all(bind=engine)
+    _migrate_generation_status(generation.GenerationStatus)
+    _migrate_api_key_ciphertext()
+
+    # create_all skips existing tables, so add columns and indexes introduced since
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+    _backfill_generation_parameters()
+
+    with engine.begin() as conn:
+        for index in DROPPED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+    for table in Base.metadata.sorted_tables:
+        existing = {i["name"] for i in inspector.get_indexes(table.name)}
+        missing = [index for index in table.indexes if index.name not in existing]
+        for index in missing:
+            index.create(bind=engine)
+        if missing:
+            # Refresh planner statistics so the new indexes get used
+            with engine.begin() as conn:
+                conn.execute(text(f"ANALYZE {table.name}"))
+
+
+def _migrate_generation_status(statuses) -> None:
+    """Convert generation statuses stored by the old enum column to plain values.
+
+    The enum column stored member names ("COMPLETED"); the string column
+    stores values ("completed").
+    """
+    column = next(
+        c for c in inspect(engine).get_columns("generations") if c["name"] == "status"
+    )
+    names = ", ".join(f"'{status.name}'" for status in statuses)
+    with engine.begin() as conn:
+        if isinstance(column["type"], Enum) and engine.dialect.name == "postgresql":
+            # Indexes on the enum column would block the type change
+            for index in ("ix_gen_provider_status", "ix_gen_status_created", "ix_gen_finished_status"):
+                conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            conn.execute(text(
+                "ALTER TABLE generations ALTER COLUMN status TYPE VARCHAR(16) USING status::text"
+            ))
+            conn.execute(text("DROP TYPE IF EXISTS generationstatus"))
+        conn.execute(text(
+            f"UPDATE generations SET status = lower(status) WHERE status IN ({names})"
+        ))
+
+
+def _backfill_generation_parameters() -> None:
+    """Copy request parameters from the old JSON column into their own columns."""
+    if "parameters" not in {c["name"] for c in inspect(engine).get_columns("generations")}:
+        return
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT id, parameters FROM generations WHERE parameters IS NOT NULL "
+            "AND duration IS NULL AND aspect_ratio IS NULL AND seed IS NULL AND fps IS NULL"
+        )).all()
+        updates = []
+        for generation_id, parameters in rows:
+            # SQLite hands JSON back as text, Postgres drivers decode it
+            if isinstance(parameters, str):
+                parameters = json.loads(parameters)
+            if not isinstance(parameters, dict):
+                continue
+            updates.append({
+                "id": generation_id,
+                "duration": parameters.get("duration"),
+                "aspect_ratio": parameters.get("aspect_ratio"),
+                "seed": parameters.get("seed"),
+                "fps": parameters.get("fps"),
+            })
+        if updates:
+            conn.execute(
+                text(
+                    "UPDATE generations SET duration = :duration, aspect_ratio = :aspect_ratio, "
+                    "seed = :seed, fps = :fps WHERE id = :id"
+                ),
+                updates,
+            )
+
+
+def _migrate_api_key_ciphertext() -> None:
+    """Convert base64 text ciphertexts from older releases to raw bytes."""
+    column = next(
+        c for c in inspect(engine).get_columns("api_keys") if c["name"] == "encrypted_key"
+    )
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            if not isinstance(column["type"], LargeBinary):
+                conn.execute(text(
+                    "ALTER TABLE api_keys ALTER COLUMN encrypted_key TYPE BYTEA "
+                    "USING decode(translate(encrypted_key, '-_', '+/'), 'base64')"
+                ))
+            return
+
+        # SQLite keeps the declared type, so look for rows still stored as text
+        rows = conn.execute(text(
+            "SELECT id, encrypted_key FROM api_keys WHERE typeof(encrypted_key) = 'text'"
+        )).all()
+        for key_id, token in rows:
+            conn.execute(
+                text("UPDATE api_keys SET encrypted_key = :token WHERE id = :id"),
+                {"token": base64.urlsafe_b64decode(token), "id": key_id},
+            )
@@ -2,13 +2,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 import os
 from pathlib import Path
 
 from .config import get_settings
 from .db.database import init_db
 from .api.routes import router
+from .providers import close_http_client
+from .services.encryption import get_encryption_service
 
 settings = get_settings()
 
@@ -17,6 +19,7 @@ app = FastAPI(
     title="MediaRouter",
     description="Open Source Video Generation Gateway",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -26,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Before"],
 )
 
 # Include API routes
@@ -40,11 +44,19 @@ if storage_path.exists():
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup."""
-    init_db()
+    if settings.init_db_on_startup:
+        init_db()
+    get_encryption_service()
     print("Database initialized")
     print(f"Server running on http://{settings.host}:{settings.port}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared provider connections."""
+    await close_http_client()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint."""
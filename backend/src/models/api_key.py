@@ -1,6 +1,7 @@
 """API Key model."""
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Index, LargeBinary, Enum as SQLEnum
 from datetime import datetime
+import base64
 import enum
 from ..db.database import Base
 
@@ -20,13 +21,18 @@ class APIKey(Base):
     __tablename__ = "api_keys"
 
     id = Column(Integer, primary_key=True, index=True)
-    provider = Column(String, nullable=False, index=True)
-    encrypted_key = Column(String, nullable=False)
+    provider = Column(String, nullable=False)
+    encrypted_key = Column(LargeBinary, nullable=False)
     status = Column(SQLEnum(KeyStatus), default=KeyStatus.ACTIVE, nullable=False)
     last_validated = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # Active key lookup per provider (also serves provider-only lookups)
+        Index("ix_apikey_provider_status", provider, status),
+    )
+
     def to_dict(self, include_key: bool = False):
         """Convert to dictionary."""
         data = {
@@ -37,5 +43,6 @@ class APIKey(Base):
             "created_at": self.created_at.isoformat(),
         }
         if include_key:
-            data["key_preview"] = f"{self.encrypted_key[:8]}...{self.encrypted_key[-4:]}"
+            token = base64.urlsafe_b64encode(self.encrypted_key).decode()
+            data["key_preview"] = f"{token[:8]}...{token[-4:]}"
         return data
@@ -1,15 +1,29 @@
 """Video Generation model."""
-from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Enum as SQLEnum
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index
+from sqlalchemy.orm import validates
+from datetime import datetime, timedelta
 import enum
 from ..db.database import Base
 
+# Timestamps are stored as naive UTC
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_unix_timestamp(value: datetime) -> int:
+    """Convert a naive UTC datetime to Unix seconds.
+
+    Plain arithmetic; datetime.timestamp() would treat naive values as
+    local time and go through the C library's mktime.
+    """
+    return (value - _EPOCH) // timedelta(seconds=1)
+
 
 class GenerationStatus(str, enum.Enum):
     """Generation status enum."""
 
     QUEUED = "queued"
     PROCESSING = "processing"
+    FINALIZING = "finalizing"  # Claimed by one worker, which is downloading the video
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
@@ -20,46 +34,97 @@ class Generation(Base):
 
     __tablename__ = "generations"
 
-    id = Column(String, primary_key=True, index=True)
-    provider = Column(String, nullable=False, index=True)
+    id = Column(String, primary_key=True)
+    provider = Column(String, nullable=False)
     model = Column(String, nullable=False, index=True)
     prompt = Column(String, nullable=False)
-    parameters = Column(JSON, nullable=True)
+    duration = Column(Integer, nullable=True)
+    aspect_ratio = Column(String(16), nullable=True)
+    seed = Column(Integer, nullable=True)
+    fps = Column(Integer, nullable=True)
     video_url = Column(String, nullable=True)
     video_path = Column(String, nullable=True)
-    status = Column(SQLEnum(GenerationStatus), default=GenerationStatus.QUEUED, nullable=False)
+    # Stored as the plain status value; new statuses need no schema change
+    status = Column(String(16), default=GenerationStatus.QUEUED.value, nullable=False)
     error_message = Column(String, nullable=True)
     cost = Column(Float, nullable=True)
     duration_seconds = Column(Float, nullable=True)
     generation_time = Column(Float, nullable=True)
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
-    provider_job_id = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    provider_job_id = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        # Newest-first listing (scanned backwards) and date-range usage
+        # reports grouped by day and provider
+        Index("ix_gen_created_provider", created_at, provider),
+        # Newest-first listings filtered by provider or status; the status
+        # one also serves the stats' completed/failed counts
+        Index("ix_gen_provider_created", provider, created_at),
+        Index("ix_gen_status_created", status, created_at),
+        # Per-model usage over a date range
+        Index("ix_gen_provider_model_created", provider, model, created_at),
+    )
+
+    @validates("status")
+    def _validate_status(self, key, value):
+        """Reject unknown statuses and store the plain value."""
+        return GenerationStatus(value).value
+
+    @property
+    def created(self) -> int:
+        """Creation time as a Unix timestamp."""
+        return to_unix_timestamp(self.created_at)
+
+    @property
+    def parameters(self):
+        """Request parameters."""
+        return {
+            "duration": self.duration,
+            "aspect_ratio": self.aspect_ratio,
+            "seed": self.seed,
+            "fps": self.fps,
+        }
+
+    @property
+    def video(self):
+        """Video details, once the video is stored."""
+        if not self.video_url:
+            return None
+        return {
+            "url": self.video_url,
+            "duration": self.duration_seconds,
+            "width": self.width,
+            "height": self.height,
+        }
+
+    @property
+    def usage(self):
+        """Cost and timing, once known."""
+        if not (self.cost or self.generation_time):
+            return None
+        return {
+            "cost": self.cost,
+            "time_seconds": self.generation_time,
+        }
+
     def to_dict(self):
-        """Convert to dictionary."""
+        """Convert to dictionary, shaped like VideoGenerationResponse."""
         return {
             "id": self.id,
             "object": "video.generation",
-            "created": int(self.created_at.timestamp()),
+            "created": self.created,
             "model": self.model,
             "provider": self.provider,
-            "status": self.status.value,
+            "status": self.status,
             "prompt": self.prompt,
             "parameters": self.parameters,
-            "video": {
-                "url": self.video_url,
-                "duration": self.duration_seconds,
-                "width": self.width,
-                "height": self.height,
-            } if self.video_url else None,
-            "usage": {
-                "cost": self.cost,
-                "time_seconds": self.generation_time,
-            } if self.cost or self.generation_time else None,
+            "video": self.video,
+            "usage": self.usage,
             "error": self.error_message,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "progress": None,
         }
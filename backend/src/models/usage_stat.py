@@ -1,5 +1,5 @@
 """Usage Statistics model."""
-from sqlalchemy import Column, Integer, String, Float, Date
+from sqlalchemy import Column, Integer, String, Float, Date, Index
 from datetime import date
 from ..db.database import Base
 
@@ -10,15 +10,25 @@ class UsageStat(Base):
     __tablename__ = "usage_stats"
 
     id = Column(Integer, primary_key=True, index=True)
-    provider = Column(String, nullable=False, index=True)
-    model = Column(String, nullable=False, index=True)
+    provider = Column(String, nullable=False)
+    model = Column(String, nullable=False)
     count = Column(Integer, default=0, nullable=False)
     total_cost = Column(Float, default=0.0, nullable=False)
     avg_time = Column(Float, default=0.0, nullable=False)
+    # Sum and number of generation times behind avg_time; a generation
+    # without a recorded time counts toward count but not these
+    total_time = Column(Float, default=0.0, nullable=True)
+    timed_count = Column(Integer, default=0, nullable=True)
     success_count = Column(Integer, default=0, nullable=False)
     failure_count = Column(Integer, default=0, nullable=False)
     date = Column(Date, default=date.today, nullable=False, index=True)
 
+    __table_args__ = (
+        # One rollup row per provider/model/day, the upsert conflict target.
+        # Also serves provider and provider/model lookups as its leading columns.
+        Index("uq_usage_stats_pmd", provider, model, date, unique=True),
+    )
+
     def to_dict(self):
         """Convert to dictionary."""
         return {
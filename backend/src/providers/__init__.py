@@ -1,5 +1,16 @@
 """Provider package."""
-from .base import VideoProvider, VideoRequest, VideoResponse, ProviderFeatures
+from datetime import datetime
+
+from cachetools import LRUCache
+
+from .base import (
+    VideoProvider,
+    VideoRequest,
+    VideoResponse,
+    ProviderFeatures,
+    get_http_client,
+    close_http_client,
+)
 from .sora import SoraProvider
 from .runway import RunwayProvider
 from .kling import KlingProvider
@@ -23,29 +34,77 @@ MODEL_PROVIDER_MAP = {
 }
 
 
+def _provider_meta(provider: VideoProvider) -> dict:
+    """Static models and features of a provider."""
+    return {
+        "models": provider.models,
+        "features": provider.get_supported_features().model_dump(),
+    }
+
+
+# Static provider metadata, computed once at import
+PROVIDER_META = {name: _provider_meta(cls(api_key="dummy")) for name, cls in PROVIDERS.items()}
+
+
 def get_provider_for_model(model: str) -> str:
     """Get provider name for a model."""
     return MODEL_PROVIDER_MAP.get(model, "openai")
 
 
 def create_provider(provider_name: str, api_key: str) -> VideoProvider:
-    """Create provider instance."""
+    """Create a provider instance for a provider and API key."""
     provider_class = PROVIDERS.get(provider_name)
     if not provider_class:
         raise ValueError(f"Unknown provider: {provider_name}")
     return provider_class(api_key)
 
 
+# Shared instances per stored key version: (provider, key ID, key updated_at)
+_provider_cache: LRUCache = LRUCache(maxsize=128)
+
+
+def get_provider(
+    provider_name: str, key_id: int, key_updated_at: datetime, api_key: str
+) -> VideoProvider:
+    """Get the shared provider instance for a stored API key.
+
+    Instances are shared per key within a process, so repeated calls reuse
+    the same headers and conditional-poll state. A key changed since (its
+    updated_at moved) gets a new instance.
+
+    Args:
+        provider_name: Provider name
+        key_id: ID of the stored API key
+        key_updated_at: The key's updated_at
+        api_key: Decrypted API key
+    """
+    cache_key = (provider_name, key_id, key_updated_at)
+    provider = _provider_cache.get(cache_key)
+    if provider is None:
+        provider = _provider_cache[cache_key] = create_provider(provider_name, api_key)
+    return provider
+
+
+def clear_provider_cache() -> None:
+    """Drop shared provider instances, e.g. after keys are revoked or deleted."""
+    _provider_cache.clear()
+
+
 __all__ = [
     "VideoProvider",
     "VideoRequest",
     "VideoResponse",
     "ProviderFeatures",
+    "get_http_client",
+    "close_http_client",
     "SoraProvider",
     "RunwayProvider",
     "KlingProvider",
     "PROVIDERS",
     "MODEL_PROVIDER_MAP",
+    "PROVIDER_META",
     "get_provider_for_model",
     "create_provider",
+    "get_provider",
+    "clear_provider_cache",
 ]
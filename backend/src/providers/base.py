@@ -1,6 +1,9 @@
 """Base provider interface."""
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+import httpx
 from pydantic import BaseModel
 
 
@@ -13,10 +16,16 @@ class VideoRequest(BaseModel):
     seed: Optional[int] = None
     fps: Optional[int] = None
     resolution: Optional[str] = None
+    callback_url: Optional[str] = None
 
 
 class VideoResponse(BaseModel):
-    """Standard video generation response."""
+    """Standard video generation response.
+
+    generate_video validates its response, since the job ID comes straight
+    from the provider's JSON and may be missing. Statuses and errors built
+    from values already checked use model_construct to skip validation.
+    """
 
     job_id: str
     status: str  # queued, processing, completed, failed
@@ -34,15 +43,66 @@ class ProviderFeatures(BaseModel):
     supports_fps: bool = False
     supports_image_to_video: bool = False
     supports_video_to_video: bool = False
+    supports_webhooks: bool = False
     max_duration: int = 10
     available_aspect_ratios: list[str] = ["16:9", "9:16", "1:1"]
 
 
+# Output dimensions for each supported aspect ratio
+ASPECT_RATIO_DIMENSIONS = {
+    "16:9": (1920, 1080),
+    "9:16": (1080, 1920),
+    "1:1": (1080, 1080),
+    "4:3": (1440, 1080),
+    "21:9": (2560, 1080),
+}
+
+
+# Shared HTTP client (keeps provider connections alive between calls)
+_http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get shared HTTP client instance."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, read=300.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class VideoProvider(ABC):
     """Base class for video generation providers."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key
+        self._client = client
+        # Built once per provider instance rather than per request
+        self.auth_headers = {"Authorization": f"Bearer {api_key}"}
+        self.json_headers = {**self.auth_headers, "Content-Type": "application/json"}
+        # Last ETag and status per job, for conditional status polls
+        self._etags: Dict[str, str] = {}
+        self._statuses: Dict[str, VideoResponse] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client, resolved per call so shared instances survive a client reset."""
+        return self._client or get_http_client()
 
     @property
     @abstractmethod
@@ -89,6 +149,54 @@ class VideoProvider(ABC):
         """
         pass
 
+    async def poll_status(
+        self,
+        job_id: str,
+        initial: float = 2.0,
+        factor: float = 1.5,
+        max_interval: float = 30.0,
+        timeout: float = 300.0,
+        wait: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> AsyncIterator[VideoResponse]:
+        """Yield a job's status after each wait of an exponential backoff.
+
+        Stops after the timeout; callers break out once they are done.
+
+        Args:
+            job_id: Job ID from initial request
+            initial: First wait in seconds
+            factor: Backoff multiplier between waits
+            max_interval: Longest wait in seconds
+            timeout: Total polling budget in seconds
+            wait: Coroutine awaited with each interval (defaults to sleeping)
+        """
+        interval = initial
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                await wait(interval)
+                interval = min(interval * factor, max_interval)
+                yield await self.check_status(job_id)
+        finally:
+            # Whether the job finished, timed out or errored, it is no longer
+            # polled; don't keep its conditional-poll state on a shared instance
+            self._forget_job(job_id)
+
+    async def poll_until_done(self, job_id: str, **kwargs: Any) -> Optional[VideoResponse]:
+        """Poll a job with exponential backoff until it completes or fails.
+
+        Args:
+            job_id: Job ID from initial request
+            **kwargs: Backoff settings, as for poll_status
+
+        Returns:
+            Final status, or None if the job was still running at the timeout
+        """
+        async for status in self.poll_status(job_id, **kwargs):
+            if status.status in ("completed", "failed"):
+                return status
+        return None
+
     @abstractmethod
     def get_supported_features(self) -> ProviderFeatures:
         """Get supported features.
@@ -98,13 +206,57 @@ class VideoProvider(ABC):
         """
         pass
 
+    def get_webhook_job_id(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Extract the job ID from a provider webhook payload.
+
+        Args:
+            payload: Webhook request body
+
+        Returns:
+            Job ID, or None if the provider doesn't send webhooks
+        """
+        return None
+
+    async def _get_job_status(self, job_id: str, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+        """GET a job's status, revalidating with the last ETag seen for it.
+
+        Only providers that send ETags get conditional requests.
+
+        Returns:
+            The response, or None if the provider answered 304 Not Modified
+            and the cached status (see _remember_status) still applies
+        """
+        headers = self.auth_headers
+        etag = self._etags.get(job_id)
+        if etag and job_id in self._statuses:
+            headers = {**headers, "If-None-Match": etag}
+
+        response = await self.client.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and job_id in self._statuses:
+            return None
+        response.raise_for_status()
+
+        etag = response.headers.get("etag")
+        if etag:
+            self._etags[job_id] = etag
+        return response
+
+    def _remember_status(self, status: VideoResponse) -> VideoResponse:
+        """Cache a parsed job status for 304 responses.
+
+        Finished jobs are no longer polled, so their entries are dropped.
+        """
+        if status.status in ("completed", "failed"):
+            self._forget_job(status.job_id)
+        else:
+            self._statuses[status.job_id] = status
+        return status
+
+    def _forget_job(self, job_id: str) -> None:
+        """Drop a job's cached ETag and status."""
+        self._etags.pop(job_id, None)
+        self._statuses.pop(job_id, None)
+
     def _normalize_aspect_ratio(self, aspect_ratio: str) -> tuple[int, int]:
         """Convert aspect ratio string to width/height tuple."""
-        ratios = {
-            "16:9": (1920, 1080),
-            "9:16": (1080, 1920),
-            "1:1": (1080, 1080),
-            "4:3": (1440, 1080),
-            "21:9": (2560, 1080),
-        }
-        return ratios.get(aspect_ratio, (1920, 1080))
+        return ASPECT_RATIO_DIMENSIONS.get(aspect_ratio, (1920, 1080))
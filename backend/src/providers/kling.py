@@ -1,9 +1,37 @@
 """Kling AI provider implementation."""
 import httpx
-from typing import Optional
+import orjson
+from typing import Any, Dict, Optional
 from .base import VideoProvider, VideoRequest, VideoResponse, ProviderFeatures
 
 
+def _result_url(data: dict, job_id: str) -> Optional[str]:
+    """Video URL of a successful Kling task."""
+    return data.get("task_result", {}).get("video_url")
+
+
+# Kling task status to our standard status and video URL extractor
+_STATUS_TABLE = {
+    "pending": ("processing", None),
+    "running": ("processing", None),
+    "success": ("completed", _result_url),
+    "failed": ("failed", None),
+}
+
+# Supported features, built once at import
+_FEATURES = ProviderFeatures(
+    supports_duration=True,
+    supports_aspect_ratio=True,
+    supports_seed=True,
+    supports_fps=True,
+    supports_image_to_video=True,
+    supports_video_to_video=True,
+    supports_webhooks=True,
+    max_duration=10,
+    available_aspect_ratios=["16:9", "9:16", "1:1"],
+)
+
+
 class KlingProvider(VideoProvider):
     """Kling AI video generation provider."""
 
@@ -20,13 +48,12 @@ class KlingProvider(VideoProvider):
     async def validate_key(self) -> bool:
         """Validate Kling API key."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/account",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    timeout=10.0,
-                )
-                return response.status_code == 200
+            response = await self.client.get(
+                f"{self.BASE_URL}/account",
+                headers=self.auth_headers,
+                timeout=10.0,
+            )
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -44,33 +71,32 @@ class KlingProvider(VideoProvider):
                 payload["aspect_ratio"] = request.aspect_ratio
             if request.seed:
                 payload["seed"] = request.seed
+            if request.callback_url:
+                payload["callback_url"] = request.callback_url
+
+            response = await self.client.post(
+                f"{self.BASE_URL}/videos/generations",
+                headers=self.json_headers,
+                content=orjson.dumps(payload),
+                timeout=300.0,
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
 
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/videos/generations",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                return VideoResponse(
-                    job_id=data.get("task_id", data.get("id")),
-                    status="processing",
-                    metadata=data,
-                )
+            return VideoResponse(
+                job_id=data.get("task_id", data.get("id")),
+                status="processing",
+                metadata=data,
+            )
 
         except httpx.HTTPStatusError as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id="",
                 status="failed",
                 error=f"HTTP {e.response.status_code}: {e.response.text}",
             )
         except Exception as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id="",
                 status="failed",
                 error=str(e),
@@ -79,53 +105,40 @@ class KlingProvider(VideoProvider):
     async def check_status(self, job_id: str) -> VideoResponse:
         """Check Kling generation status."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/videos/generations/{job_id}",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                status_map = {
-                    "pending": "processing",
-                    "running": "processing",
-                    "success": "completed",
-                    "failed": "failed",
-                }
-
-                status = status_map.get(data.get("task_status"), "processing")
-                video_url = data.get("task_result", {}).get("video_url") if status == "completed" else None
-
-                return VideoResponse(
-                    job_id=job_id,
-                    status=status,
-                    video_url=video_url,
-                    metadata=data,
-                )
+            response = await self._get_job_status(
+                job_id, f"{self.BASE_URL}/videos/generations/{job_id}", timeout=30.0
+            )
+            if response is None:
+                return self._statuses[job_id]
+            data = orjson.loads(response.content)
+
+            status, extract_url = _STATUS_TABLE.get(data.get("task_status"), ("processing", None))
+            video_url = extract_url(data, job_id) if extract_url else None
+
+            return self._remember_status(VideoResponse.model_construct(
+                job_id=job_id,
+                status=status,
+                video_url=video_url,
+                metadata=data,
+            ))
 
         except httpx.HTTPStatusError as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id=job_id,
                 status="failed",
                 error=f"HTTP {e.response.status_code}: {e.response.text}",
             )
         except Exception as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id=job_id,
                 status="failed",
                 error=str(e),
             )
 
+    def get_webhook_job_id(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Extract the task ID from a Kling callback."""
+        return payload.get("task_id")
+
     def get_supported_features(self) -> ProviderFeatures:
         """Get Kling supported features."""
-        return ProviderFeatures(
-            supports_duration=True,
-            supports_aspect_ratio=True,
-            supports_seed=True,
-            supports_fps=True,
-            supports_image_to_video=True,
-            supports_video_to_video=True,
-            max_duration=10,
-            available_aspect_ratios=["16:9", "9:16", "1:1"],
-        )
+        return _FEATURES
@@ -1,9 +1,37 @@
 """Runway provider implementation."""
 import httpx
-from typing import Optional
+import orjson
+from typing import Any, Dict, Optional
 from .base import VideoProvider, VideoRequest, VideoResponse, ProviderFeatures
 
 
+def _output_url(data: dict, job_id: str) -> Optional[str]:
+    """Video URL of a succeeded Runway task."""
+    return data.get("output", {}).get("url")
+
+
+# Runway task status to our standard status and video URL extractor
+_STATUS_TABLE = {
+    "pending": ("processing", None),
+    "processing": ("processing", None),
+    "succeeded": ("completed", _output_url),
+    "failed": ("failed", None),
+}
+
+# Supported features, built once at import
+_FEATURES = ProviderFeatures(
+    supports_duration=True,
+    supports_aspect_ratio=True,
+    supports_seed=True,
+    supports_fps=False,
+    supports_image_to_video=True,
+    supports_video_to_video=False,
+    supports_webhooks=True,
+    max_duration=10,
+    available_aspect_ratios=["16:9", "9:16", "1:1", "4:3"],
+)
+
+
 class RunwayProvider(VideoProvider):
     """Runway Gen-3/Gen-4 video generation provider."""
 
@@ -20,13 +48,12 @@ class RunwayProvider(VideoProvider):
     async def validate_key(self) -> bool:
         """Validate Runway API key."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/teams",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    timeout=10.0,
-                )
-                return response.status_code == 200
+            response = await self.client.get(
+                f"{self.BASE_URL}/teams",
+                headers=self.auth_headers,
+                timeout=10.0,
+            )
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -46,33 +73,32 @@ class RunwayProvider(VideoProvider):
                 payload["height"] = height
             if request.seed:
                 payload["seed"] = request.seed
+            if request.callback_url:
+                payload["callback_url"] = request.callback_url
+
+            response = await self.client.post(
+                f"{self.BASE_URL}/generations",
+                headers=self.json_headers,
+                content=orjson.dumps(payload),
+                timeout=300.0,
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
 
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/generations",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                return VideoResponse(
-                    job_id=data.get("id"),
-                    status="processing",
-                    metadata=data,
-                )
+            return VideoResponse(
+                job_id=data.get("id"),
+                status="processing",
+                metadata=data,
+            )
 
         except httpx.HTTPStatusError as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id="",
                 status="failed",
                 error=f"HTTP {e.response.status_code}: {e.response.text}",
             )
         except Exception as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id="",
                 status="failed",
                 error=str(e),
@@ -81,53 +107,40 @@ class RunwayProvider(VideoProvider):
     async def check_status(self, job_id: str) -> VideoResponse:
         """Check Runway generation status."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/generations/{job_id}",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                status_map = {
-                    "pending": "processing",
-                    "processing": "processing",
-                    "succeeded": "completed",
-                    "failed": "failed",
-                }
-
-                status = status_map.get(data.get("status"), "processing")
-                video_url = data.get("output", {}).get("url") if status == "completed" else None
-
-                return VideoResponse(
-                    job_id=job_id,
-                    status=status,
-                    video_url=video_url,
-                    metadata=data,
-                )
+            response = await self._get_job_status(
+                job_id, f"{self.BASE_URL}/generations/{job_id}", timeout=30.0
+            )
+            if response is None:
+                return self._statuses[job_id]
+            data = orjson.loads(response.content)
+
+            status, extract_url = _STATUS_TABLE.get(data.get("status"), ("processing", None))
+            video_url = extract_url(data, job_id) if extract_url else None
+
+            return self._remember_status(VideoResponse.model_construct(
+                job_id=job_id,
+                status=status,
+                video_url=video_url,
+                metadata=data,
+            ))
 
         except httpx.HTTPStatusError as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id=job_id,
                 status="failed",
                 error=f"HTTP {e.response.status_code}: {e.response.text}",
             )
         except Exception as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id=job_id,
                 status="failed",
                 error=str(e),
             )
 
+    def get_webhook_job_id(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Extract the generation ID from a Runway webhook."""
+        return payload.get("id")
+
     def get_supported_features(self) -> ProviderFeatures:
         """Get Runway supported features."""
-        return ProviderFeatures(
-            supports_duration=True,
-            supports_aspect_ratio=True,
-            supports_seed=True,
-            supports_fps=False,
-            supports_image_to_video=True,
-            supports_video_to_video=False,
-            max_duration=10,
-            available_aspect_ratios=["16:9", "9:16", "1:1", "4:3"],
-        )
+        return _FEATURES
@@ -3,11 +3,52 @@
 Official API Documentation: https://platform.openai.com/docs/api-reference/videos
 """
 import httpx
+import orjson
 import asyncio
 from typing import Optional
 from .base import VideoProvider, VideoRequest, VideoResponse, ProviderFeatures
 
 
+# Output size for each aspect ratio
+_SIZE_MAP = {
+    "9:16": "720x1280",   # Portrait
+    "16:9": "1280x720",   # Landscape
+    "1:1": "1024x1024",   # Square
+}
+
+
+def _content_url(data: dict, job_id: str) -> str:
+    """OpenAI serves finished videos at /v1/videos/{video_id}/content."""
+    return f"{SoraProvider.BASE_URL}/videos/{job_id}/content"
+
+
+# OpenAI video status to our standard status and video URL extractor
+_STATUS_TABLE = {
+    "queued": ("processing", None),
+    "processing": ("processing", None),
+    "completed": ("completed", _content_url),
+    "failed": ("failed", None),
+    "cancelled": ("failed", None),
+}
+
+# Based on official OpenAI documentation:
+# - Supports text-to-video and image-to-video
+# - Generates video with synced audio
+# - Portrait: 720x1280, Landscape: 1280x720
+# - Pricing: $0.10 per second
+# - Default: 4 seconds, up to 20 seconds
+_FEATURES = ProviderFeatures(
+    supports_duration=True,
+    supports_aspect_ratio=True,
+    supports_seed=False,  # Not in current API docs
+    supports_fps=False,
+    supports_image_to_video=True,  # Via input_reference parameter
+    supports_video_to_video=True,  # Via remix endpoint
+    max_duration=20,
+    available_aspect_ratios=["16:9", "9:16", "1:1"],
+)
+
+
 class SoraProvider(VideoProvider):
     """OpenAI Sora video generation provider.
 
@@ -30,13 +71,12 @@ class SoraProvider(VideoProvider):
     async def validate_key(self) -> bool:
         """Validate OpenAI API key using the models endpoint."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/models",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    timeout=10.0,
-                )
-                return response.status_code == 200
+            response = await self.client.get(
+                f"{self.BASE_URL}/models",
+                headers=self.auth_headers,
+                timeout=10.0,
+            )
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -79,33 +119,25 @@ class SoraProvider(VideoProvider):
 
             # Size (resolution as "widthxheight")
             if request.aspect_ratio:
-                size_map = {
-                    "9:16": "720x1280",   # Portrait
-                    "16:9": "1280x720",   # Landscape
-                    "1:1": "1024x1024",   # Square
-                }
-                payload["size"] = size_map.get(request.aspect_ratio, "1280x720")
+                payload["size"] = _SIZE_MAP.get(request.aspect_ratio, "1280x720")
 
             # Make request to OpenAI Videos API
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/videos",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Return job ID for polling
-                # OpenAI returns: {"id": "video_123", "status": "queued", ...}
-                return VideoResponse(
-                    job_id=data.get("id"),
-                    status="processing",  # Map "queued" to our "processing" status
-                    metadata=data,
-                )
+            response = await self.client.post(
+                f"{self.BASE_URL}/videos",
+                headers=self.json_headers,
+                content=orjson.dumps(payload),
+                timeout=300.0,
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            # Return job ID for polling
+            # OpenAI returns: {"id": "video_123", "status": "queued", ...}
+            return VideoResponse(
+                job_id=data.get("id"),
+                status="processing",  # Map "queued" to our "processing" status
+                metadata=data,
+            )
 
         except httpx.HTTPStatusError as e:
             error_detail = e.response.text
@@ -116,13 +148,13 @@ class SoraProvider(VideoProvider):
             except:
                 pass
 
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id="",
                 status="failed",
                 error=f"HTTP {e.response.status_code}: {error_detail}",
             )
         except Exception as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id="",
                 status="failed",
                 error=str(e),
@@ -149,39 +181,24 @@ class SoraProvider(VideoProvider):
         When completed, download URL is at: /v1/videos/{video_id}/content
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/videos/{job_id}",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Get status from response
-                status = data.get("status", "processing")
-                video_url = None
-
-                # Map OpenAI status to our standard status
-                status_map = {
-                    "queued": "processing",
-                    "processing": "processing",
-                    "completed": "completed",
-                    "failed": "failed",
-                    "cancelled": "failed",
-                }
-                mapped_status = status_map.get(status, status)
-
-                # If completed, construct the download URL
-                if mapped_status == "completed":
-                    # OpenAI video content is available at /v1/videos/{video_id}/content
-                    video_url = f"{self.BASE_URL}/videos/{job_id}/content"
-
-                return VideoResponse(
-                    job_id=job_id,
-                    status=mapped_status,
-                    video_url=video_url,
-                    metadata=data,
-                )
+            response = await self._get_job_status(
+                job_id, f"{self.BASE_URL}/videos/{job_id}", timeout=30.0
+            )
+            if response is None:
+                return self._statuses[job_id]
+            data = orjson.loads(response.content)
+
+            # Map OpenAI status to our standard status; unknown ones pass through
+            status = data.get("status", "processing")
+            mapped_status, extract_url = _STATUS_TABLE.get(status, (status, None))
+            video_url = extract_url(data, job_id) if extract_url else None
+
+            return self._remember_status(VideoResponse.model_construct(
+                job_id=job_id,
+                status=mapped_status,
+                video_url=video_url,
+                metadata=data,
+            ))
 
         except httpx.HTTPStatusError as e:
             error_detail = e.response.text
@@ -192,35 +209,18 @@ class SoraProvider(VideoProvider):
             except:
                 pass
 
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id=job_id,
                 status="failed",
                 error=f"HTTP {e.response.status_code}: {error_detail}",
             )
         except Exception as e:
-            return VideoResponse(
+            return VideoResponse.model_construct(
                 job_id=job_id,
                 status="failed",
                 error=str(e),
             )
 
     def get_supported_features(self) -> ProviderFeatures:
-        """Get Sora 2 supported features.
-
-        Based on official OpenAI documentation:
-        - Supports text-to-video and image-to-video
-        - Generates video with synced audio
-        - Portrait: 720x1280, Landscape: 1280x720
-        - Pricing: $0.10 per second
-        - Default: 4 seconds, up to 20 seconds
-        """
-        return ProviderFeatures(
-            supports_duration=True,
-            supports_aspect_ratio=True,
-            supports_seed=False,  # Not in current API docs
-            supports_fps=False,
-            supports_image_to_video=True,  # Via input_reference parameter
-            supports_video_to_video=True,  # Via remix endpoint
-            max_duration=20,
-            available_aspect_ratios=["16:9", "9:16", "1:1"],
-        )
+        """Get Sora 2 supported features."""
+        return _FEATURES
@@ -0,0 +1,106 @@
+"""Redis cache service."""
+import asyncio
+import json
+import time
+from typing import Any, Optional
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from ..config import get_settings
+
+# Cache keys
+PROVIDERS_CACHE_KEY = "providers:list"
+USAGE_STATS_CACHE_KEY = "analytics:global:dashboard"
+
+
+def detailed_usage_cache_key(
+    start_date: Optional[str], end_date: Optional[str], provider: Optional[str]
+) -> str:
+    """Cache key for a detailed usage report and its filters."""
+    return f"analytics:detailed:{start_date or ''}:{end_date or ''}:{provider or ''}"
+
+
+def generation_progress_key(generation_id: str) -> str:
+    """Cache key for a running generation's polling progress."""
+    return f"gen:{generation_id}:progress"
+
+
+def generation_done_channel(generation_id: str) -> str:
+    """Pub/sub channel signalled when a generation is finished by webhook."""
+    return f"gen:{generation_id}:done"
+
+
+class CacheService:
+    """JSON cache backed by Redis.
+
+    Cache errors are swallowed so callers fall back to the database when
+    Redis is unavailable.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.client = redis.from_url(settings.redis_url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None on a miss."""
+        try:
+            cached = await self.client.get(key)
+        except RedisError:
+            return None
+        return json.loads(cached) if cached is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Cache a JSON-serializable value for ttl seconds."""
+        try:
+            await self.client.set(key, json.dumps(value), ex=ttl)
+        except RedisError:
+            pass
+
+    async def delete(self, *keys: str) -> None:
+        """Invalidate cached keys."""
+        try:
+            await self.client.delete(*keys)
+        except RedisError:
+            pass
+
+    async def publish(self, channel: str) -> None:
+        """Signal subscribers waiting on a channel."""
+        try:
+            await self.client.publish(channel, "1")
+        except RedisError:
+            pass
+
+    async def wait_for_message(self, channel: str, timeout: float) -> bool:
+        """Wait up to timeout seconds for a message on a channel.
+
+        Sleeps out the timeout instead when Redis is unavailable.
+
+        Returns:
+            True if a message arrived before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            async with self.client.pubsub() as pubsub:
+                await pubsub.subscribe(channel)
+                remaining = timeout
+                while remaining > 0:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=remaining
+                    )
+                    if message is not None:
+                        return True
+                    remaining = deadline - time.monotonic()
+        except RedisError:
+            await asyncio.sleep(max(deadline - time.monotonic(), 0))
+        return False
+
+
+# Singleton instance
+_cache_service = None
+
+
+def get_cache_service() -> CacheService:
+    """Get cache service instance."""
+    global _cache_service
+    if _cache_service is None:
+        _cache_service = CacheService()
+    return _cache_service
@@ -1,26 +1,60 @@
 """Encryption service for API keys."""
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from ..config import get_settings
 import base64
 import hashlib
+import os
+
+# First byte of a decoded token, identifying how it was encrypted
+_FERNET_VERSION = 0x80  # Written before the switch to AES-GCM
+_AESGCM_VERSION = 0x02
+
+_NONCE_SIZE = 12
+
+# Keys are derived once per process
+_SECRET = get_settings().encryption_key.encode()
+_DERIVED_KEY = HKDF(
+    algorithm=hashes.SHA256(),
+    length=32,
+    salt=None,
+    info=b"mediagateway-api-key-v1",
+).derive(_SECRET)
+# Fernet key of tokens written before AES-GCM
+_LEGACY_KEY = hashlib.sha256(_SECRET).digest()
 
 
 class EncryptionService:
-    """Service for encrypting and decrypting API keys."""
+    """Service for encrypting and decrypting API keys.
+
+    Tokens are raw bytes: a version byte, a 12-byte nonce and the
+    AES-256-GCM ciphertext. Fernet tokens from earlier releases are
+    still decrypted.
+    """
 
     def __init__(self):
-        settings = get_settings()
-        # Derive a valid Fernet key from the encryption key
-        key = hashlib.sha256(settings.encryption_key.encode()).digest()
-        self.cipher = Fernet(base64.urlsafe_b64encode(key))
+        self.aead = AESGCM(_DERIVED_KEY)
+        self.legacy_cipher = Fernet(base64.urlsafe_b64encode(_LEGACY_KEY))
+
+        # The first AES-GCM call loads OpenSSL's cipher provider; pay for it
+        # here (and check the key round-trips) rather than on a request
+        self.decrypt(self.encrypt("warmup"))
 
-    def encrypt(self, plaintext: str) -> str:
+    def encrypt(self, plaintext: str) -> bytes:
         """Encrypt a string."""
-        return self.cipher.encrypt(plaintext.encode()).decode()
+        nonce = os.urandom(_NONCE_SIZE)
+        return bytes([_AESGCM_VERSION]) + nonce + self.aead.encrypt(nonce, plaintext.encode(), None)
+
+    def decrypt(self, token: bytes) -> str:
+        """Decrypt a token to a string."""
+        if token[0] == _FERNET_VERSION:
+            # Fernet only accepts its own base64 form
+            return self.legacy_cipher.decrypt(base64.urlsafe_b64encode(token)).decode()
 
-    def decrypt(self, ciphertext: str) -> str:
-        """Decrypt a string."""
-        return self.cipher.decrypt(ciphertext.encode()).decode()
+        nonce = token[1:1 + _NONCE_SIZE]
+        return self.aead.decrypt(nonce, token[1 + _NONCE_SIZE:], None).decode()
 
 
 # Singleton instance
@@ -0,0 +1,130 @@
+"""Batching of generation submissions."""
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import insert, update
+
+from ..db.database import AsyncSessionLocal
+from ..models.generation import Generation, GenerationStatus
+from ..workers import celery_app
+from ..workers.video import process_video_generation
+
+# Flush a batch after 20ms, or as soon as it holds 100 submissions
+BATCH_WINDOW = 0.02
+BATCH_MAX_SIZE = 100
+
+
+class GenerationBatcher:
+    """Coalesces generation inserts and job enqueues across requests.
+
+    Bursts of submissions are written with one multi-row INSERT and one
+    commit, then queued over a single broker connection. Each caller
+    still waits for its own submission to be durable and queued.
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[Dict[str, Any], tuple, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def submit(self, row: Dict[str, Any], job_args: tuple) -> None:
+        """Insert a generation row and queue its worker job.
+
+        Args:
+            row: Generation column values
+            job_args: Arguments for the process_video_generation task
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, job_args, future))
+
+        if len(self._pending) >= BATCH_MAX_SIZE:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(BATCH_WINDOW, self._flush_pending)
+
+        await future
+
+    def _flush_pending(self) -> None:
+        """Start flushing the pending batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], tuple, asyncio.Future]]) -> None:
+        """Write a batch of generations and queue their jobs."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(Generation), [row for row, _, _ in batch])
+                await db.commit()
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Broker calls block, so keep them off the event loop
+        errors = await asyncio.get_running_loop().run_in_executor(
+            None, _publish_jobs, [job_args for _, job_args, _ in batch]
+        )
+
+        # Rows whose job never reached the broker would stay queued forever
+        failed_ids = [row["id"] for (row, _, _), error in zip(batch, errors) if error]
+        try:
+            if failed_ids:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(Generation)
+                        .where(Generation.id.in_(failed_ids))
+                        .values(
+                            status=GenerationStatus.FAILED.value,
+                            error_message="Could not queue generation",
+                        )
+                    )
+                    await db.commit()
+        finally:
+            for (_, _, future), error in zip(batch, errors):
+                if future.done():
+                    continue
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(None)
+
+
+def _publish_jobs(jobs: List[tuple]) -> List[Optional[Exception]]:
+    """Queue worker jobs over one broker connection.
+
+    Returns:
+        The publish error for each job, or None where it was queued
+    """
+    errors: List[Optional[Exception]] = []
+    try:
+        with celery_app.producer_or_acquire() as producer:
+            for job_args in jobs:
+                try:
+                    process_video_generation.apply_async(job_args, producer=producer)
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(e)
+    except Exception as e:
+        # No broker connection: the remaining jobs were never sent
+        errors.extend([e] * (len(jobs) - len(errors)))
+    return errors
+
+
+# Singleton instance
+_generation_batcher = None
+
+
+def get_generation_batcher() -> GenerationBatcher:
+    """Get generation batcher instance."""
+    global _generation_batcher
+    if _generation_batcher is None:
+        _generation_batcher = GenerationBatcher()
+    return _generation_batcher
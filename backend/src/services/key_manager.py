@@ -1,18 +1,49 @@
 """API Key management service."""
-from sqlalchemy.orm import Session
+import base64
+import logging
+from cachetools import TTLCache
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from ..models.api_key import APIKey, KeyStatus
+from ..providers import clear_provider_cache
+from .cache import get_cache_service
 from .encryption import get_encryption_service
+from ..config import get_settings
 from datetime import datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=64)
+def _decrypt(key_id: int, updated_at: datetime, encrypted_key: bytes) -> str:
+    """Decrypt an API key, memoized per key version.
+
+    Keying on updated_at means a key changed by another process gets a
+    fresh entry here instead of reusing the old one.
+    """
+    return get_encryption_service().decrypt(encrypted_key)
+
+
+def provider_cache_key(provider: str) -> str:
+    """Cache key for a provider's active API key."""
+    return f"api_key:provider:{provider}"
 
 
 class KeyManager:
     """Manages API keys for providers."""
 
     def __init__(self):
+        settings = get_settings()
         self.encryption = get_encryption_service()
+        self.cache = get_cache_service()
+        self.cache_ttl = settings.api_key_cache_ttl
+        # Active key per provider, in front of Redis. Other processes can't
+        # invalidate it, so its short TTL bounds how long they serve a stale key.
+        self._active_keys = TTLCache(maxsize=256, ttl=settings.api_key_local_cache_ttl)
 
-    def add_key(self, db: Session, provider: str, api_key: str) -> APIKey:
+    async def add_key(self, db: AsyncSession, provider: str, api_key: str) -> APIKey:
         """Add a new API key."""
         encrypted = self.encryption.encrypt(api_key)
 
@@ -22,59 +53,130 @@ class KeyManager:
             status=KeyStatus.ACTIVE,
         )
         db.add(db_key)
-        db.commit()
-        db.refresh(db_key)
+        await db.commit()
+        await self._invalidate(provider)
         return db_key
 
-    def get_key(self, db: Session, key_id: int) -> Optional[APIKey]:
-        """Get an API key by ID."""
-        return db.query(APIKey).filter(APIKey.id == key_id).first()
+    async def get_key(self, db: AsyncSession, key_id: int) -> Optional[APIKey]:
+        """Get an API key by ID.
+
+        Served from the session's identity map when already loaded, as when
+        a route looks a key up and then updates its status.
+        """
+        return await db.get(APIKey, key_id)
+
+    async def get_key_by_provider(self, db: AsyncSession, provider: str) -> Optional[APIKey]:
+        """Get active API key for a provider.
+
+        Cached in process and in Redis (still encrypted) to skip the
+        database on the generation hot path. The returned key is detached.
+        """
+        db_key = self._active_keys.get(provider)
+        if db_key is not None:
+            return db_key
+
+        cache_key = provider_cache_key(provider)
+        cached = await self.cache.get(cache_key)
+        # Entries cached before updated_at was stored count as misses
+        if cached and "updated_at" in cached:
+            logger.debug("api key cache hit", extra={"provider": provider})
+        else:
+            logger.debug("api key cache miss", extra={"provider": provider})
+            result = await db.execute(
+                select(APIKey)
+                .where(APIKey.provider == provider, APIKey.status == KeyStatus.ACTIVE)
+                .limit(1)
+            )
+            found = result.scalars().first()
+            if not found:
+                return None
+            cached = {
+                "id": found.id,
+                "provider": found.provider,
+                # JSON needs text; same encoding the column used to hold
+                "encrypted_key": base64.urlsafe_b64encode(found.encrypted_key).decode(),
+                "status": found.status.value,
+                "updated_at": found.updated_at.isoformat(),
+            }
+            await self.cache.set(cache_key, cached, self.cache_ttl)
 
-    def get_key_by_provider(self, db: Session, provider: str) -> Optional[APIKey]:
-        """Get active API key for a provider."""
-        return (
-            db.query(APIKey)
-            .filter(APIKey.provider == provider, APIKey.status == KeyStatus.ACTIVE)
-            .first()
+        db_key = APIKey(
+            id=cached["id"],
+            provider=cached["provider"],
+            encrypted_key=base64.urlsafe_b64decode(cached["encrypted_key"]),
+            status=KeyStatus(cached["status"]),
+            updated_at=datetime.fromisoformat(cached["updated_at"]),
         )
+        self._active_keys[provider] = db_key
+        return db_key
 
-    def list_keys(self, db: Session) -> List[APIKey]:
+    async def list_keys(self, db: AsyncSession) -> List[APIKey]:
         """List all API keys."""
-        return db.query(APIKey).filter(APIKey.status != KeyStatus.REVOKED).all()
+        result = await db.execute(select(APIKey).where(APIKey.status != KeyStatus.REVOKED))
+        return list(result.scalars().all())
 
     def decrypt_key(self, api_key: APIKey) -> str:
         """Decrypt an API key."""
-        return self.encryption.decrypt(api_key.encrypted_key)
+        return _decrypt(api_key.id, api_key.updated_at, api_key.encrypted_key)
 
-    def update_key_status(
-        self, db: Session, key_id: int, status: KeyStatus
+    async def update_key_status(
+        self, db: AsyncSession, key_id: int, status: KeyStatus
     ) -> Optional[APIKey]:
         """Update key status."""
-        db_key = self.get_key(db, key_id)
+        db_key = await self.get_key(db, key_id)
         if db_key:
             db_key.status = status
             db_key.last_validated = datetime.utcnow()
-            db.commit()
-            db.refresh(db_key)
+            await db.commit()
+            await self._invalidate(db_key.provider)
         return db_key
 
-    def revoke_key(self, db: Session, key_id: int) -> bool:
+    async def revoke_key(self, db: AsyncSession, key_id: int) -> bool:
         """Revoke an API key."""
-        db_key = self.get_key(db, key_id)
-        if db_key:
-            db_key.status = KeyStatus.REVOKED
-            db.commit()
-            return True
-        return False
+        return await self.revoke_keys(db, [key_id]) > 0
+
+    async def revoke_keys(self, db: AsyncSession, key_ids: List[int]) -> int:
+        """Revoke several API keys with a single UPDATE.
+
+        Returns:
+            Number of keys revoked
+        """
+        result = await db.execute(
+            update(APIKey)
+            .where(APIKey.id.in_(key_ids))
+            .values(status=KeyStatus.REVOKED)
+            .returning(APIKey.provider)
+        )
+        return await self._commit_and_invalidate(db, result.scalars().all())
 
-    def delete_key(self, db: Session, key_id: int) -> bool:
+    async def delete_key(self, db: AsyncSession, key_id: int) -> bool:
         """Delete an API key permanently."""
-        db_key = self.get_key(db, key_id)
-        if db_key:
-            db.delete(db_key)
-            db.commit()
-            return True
-        return False
+        return await self.delete_keys(db, [key_id]) > 0
+
+    async def delete_keys(self, db: AsyncSession, key_ids: List[int]) -> int:
+        """Delete several API keys permanently with a single DELETE.
+
+        Returns:
+            Number of keys deleted
+        """
+        result = await db.execute(
+            delete(APIKey).where(APIKey.id.in_(key_ids)).returning(APIKey.provider)
+        )
+        return await self._commit_and_invalidate(db, result.scalars().all())
+
+    async def _commit_and_invalidate(self, db: AsyncSession, providers: List[str]) -> int:
+        """Commit a bulk key change and drop cached keys of affected providers."""
+        await db.commit()
+        for provider in set(providers):
+            await self._invalidate(provider)
+        return len(providers)
+
+    async def _invalidate(self, provider: str):
+        """Drop cached copies of a provider's keys after a change."""
+        self._active_keys.pop(provider, None)
+        await self.cache.delete(provider_cache_key(provider))
+        _decrypt.cache_clear()
+        clear_provider_cache()
 
 
 # Singleton instance
@@ -0,0 +1,71 @@
+"""Daily usage rollups."""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.usage_stat import UsageStat
+
+# Both dialects support INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+async def record_generation(
+    db: AsyncSession,
+    provider: str,
+    model: str,
+    cost: Optional[float],
+    time_seconds: Optional[float],
+    success: bool,
+) -> None:
+    """Add a finished generation to its provider/model/day rollup.
+
+    Runs as a single upsert, so concurrent workers don't need to read
+    and lock the row first.
+
+    Args:
+        db: Database session (committed by the caller)
+        provider: Provider name
+        model: Model name
+        cost: Generation cost in USD, if known
+        time_seconds: Generation time, if known
+        success: Whether the generation completed
+    """
+    insert = _UPSERT_INSERTS[db.bind.dialect.name]
+    table = UsageStat.__table__
+    stmt = insert(table).values(
+        provider=provider,
+        model=model,
+        date=datetime.utcnow().date(),
+        count=1,
+        total_cost=cost or 0.0,
+        avg_time=time_seconds or 0.0,
+        total_time=time_seconds or 0.0,
+        timed_count=0 if time_seconds is None else 1,
+        success_count=1 if success else 0,
+        failure_count=0 if success else 1,
+    )
+
+    # SET expressions see the row's pre-update values; the time columns
+    # are NULL on rows written before they were added
+    total_time = func.coalesce(table.c.total_time, 0.0) + stmt.excluded.total_time
+    timed_count = func.coalesce(table.c.timed_count, 0) + stmt.excluded.timed_count
+    updates = {
+        "count": table.c.count + 1,
+        "total_cost": table.c.total_cost + stmt.excluded.total_cost,
+        "success_count": table.c.success_count + stmt.excluded.success_count,
+        "failure_count": table.c.failure_count + stmt.excluded.failure_count,
+        "total_time": total_time,
+        "timed_count": timed_count,
+        "avg_time": func.coalesce(total_time / func.nullif(timed_count, 0), 0.0),
+    }
+
+    await db.execute(
+        stmt.on_conflict_do_update(index_elements=["provider", "model", "date"], set_=updates)
+    )
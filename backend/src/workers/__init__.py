@@ -0,0 +1,58 @@
+"""Background workers package."""
+import asyncio
+from celery import Celery
+from celery.signals import worker_process_init
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+from ..config import get_settings
+from ..services.encryption import get_encryption_service
+
+settings = get_settings()
+
+# Celery application (Redis broker)
+celery_app = Celery(
+    "mediarouter",
+    broker=settings.redis_url,
+    include=["src.workers.video"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    # Re-deliver jobs if a worker dies mid-generation
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Generations are long-running, so don't hoard jobs per worker
+    worker_prefetch_multiplier=1,
+)
+
+
+@worker_process_init.connect
+def warm_up_worker_process(**kwargs):
+    """Build per-process services before the first task arrives."""
+    get_encryption_service()
+
+
+# Event loop owned by this worker process
+_loop = None
+
+
+def run_async(coro):
+    """Run a coroutine on this worker process's event loop.
+
+    A persistent loop (rather than asyncio.run per task) lets async
+    clients such as the Redis cache keep their connections across tasks.
+    Uses uvloop when installed, as the production API server does.
+    """
+    global _loop
+    if _loop is None:
+        _loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+__all__ = ["celery_app", "run_async"]
@@ -0,0 +1,440 @@
+"""Video generation worker tasks."""
+import asyncio
+import hashlib
+import hmac
+import re
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+
+from . import celery_app, run_async
+from ..config import get_settings
+from ..db.database import AsyncSessionLocal
+from ..models import APIKey, KeyStatus, Generation, GenerationStatus
+from ..providers import get_provider, VideoProvider, VideoRequest, VideoResponse
+from ..services.cache import (
+    get_cache_service,
+    generation_done_channel,
+    generation_progress_key,
+    USAGE_STATS_CACHE_KEY,
+)
+from ..services.cost_calculator import calculate_cost
+from ..services.key_manager import get_key_manager
+from ..services.usage_stats import record_generation
+from ..services.video_storage import get_video_storage
+
+# Status polling schedule: 2s, 3s, 4.5s, ... capped at 30s, 5 minutes total
+POLL_INITIAL_DELAY = 2.0
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 30.0
+POLL_TIMEOUT = 300.0
+
+# Provider-reported video size, e.g. "1280x720"
+_SIZE_RE = re.compile(r"^\s*(\d+)\s*x\s*(\d+)\s*$")
+
+# Progress entries outlive the polling window so stalled jobs stay visible
+PROGRESS_TTL = 3600
+
+# Statuses a worker may still move a generation out of
+ACTIVE_STATUSES = (GenerationStatus.QUEUED.value, GenerationStatus.PROCESSING.value)
+# Held by the one worker that won the claim to download the video
+CLAIMED_STATUSES = (GenerationStatus.FINALIZING.value,)
+# A claim older than this belongs to a worker that died mid-download, so a
+# redelivered task may hand the generation back to polling
+CLAIM_TIMEOUT = 900.0
+
+
+@celery_app.task
+def process_video_generation(
+    generation_id: str,
+    provider_name: str,
+    api_key_id: int,
+    request: Dict[str, Any],
+):
+    """Process video generation on a worker.
+
+    Args:
+        generation_id: Generation record ID
+        provider_name: Provider to generate with
+        api_key_id: ID of the provider API key (decrypted on the worker)
+        request: Serialized video generation request
+    """
+    run_async(_process_video_generation(generation_id, provider_name, api_key_id, request))
+
+
+@celery_app.task
+def finalize_video_generation(generation_id: str, provider_name: str, api_key_id: int):
+    """Finish a generation after its provider reported completion via webhook.
+
+    Args:
+        generation_id: Generation record ID
+        provider_name: Provider that ran the job
+        api_key_id: ID of the provider API key (decrypted on the worker)
+    """
+    run_async(_finalize_video_generation(generation_id, provider_name, api_key_id))
+
+
+# Database access below uses a short session per read or write, so no
+# pooled connection is held while waiting on providers or sleeping.
+
+
+async def _get_provider(provider_name: str, api_key_id: int) -> Tuple[VideoProvider, str]:
+    """Load and decrypt a provider API key, so plaintext never enters the queue.
+
+    Returns:
+        The shared provider instance for the key, and the decrypted key
+    """
+    async with AsyncSessionLocal() as db:
+        api_key = await db.get(APIKey, api_key_id)
+    if not api_key or api_key.status != KeyStatus.ACTIVE:
+        raise ValueError("Provider API key is no longer active")
+    plaintext = get_key_manager().decrypt_key(api_key)
+    return get_provider(provider_name, api_key.id, api_key.updated_at, plaintext), plaintext
+
+
+async def _get_generation(generation_id: str) -> Optional[Generation]:
+    """Load a detached generation row."""
+    async with AsyncSessionLocal() as db:
+        return await db.get(Generation, generation_id)
+
+
+async def _release_stale_claim(generation: Generation) -> None:
+    """Return a generation left in a dead worker's claim to processing."""
+    if generation.status not in CLAIMED_STATUSES:
+        return
+    cutoff = datetime.utcnow() - timedelta(seconds=CLAIM_TIMEOUT)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(Generation)
+            .where(
+                Generation.id == generation.id,
+                Generation.status.in_(CLAIMED_STATUSES),
+                Generation.updated_at < cutoff,
+            )
+            .values(status=GenerationStatus.PROCESSING.value)
+        )
+        await db.commit()
+    if result.rowcount == 1:
+        generation.status = GenerationStatus.PROCESSING.value
+
+
+async def _get_generation_status(generation_id: str) -> Optional[str]:
+    """Read only a generation's current status."""
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(Generation.status).where(Generation.id == generation_id))
+
+
+def _transition(generation_id: str, from_statuses: Sequence[str], values: Dict[str, Any]):
+    """Build an UPDATE that only applies while the row is in one of from_statuses.
+
+    The poll loop and a webhook-triggered finalize can race on the same
+    generation; the status guard lets exactly one of them move it on.
+    """
+    return (
+        update(Generation)
+        .where(Generation.id == generation_id, Generation.status.in_(from_statuses))
+        .values(**values)
+    )
+
+
+async def _update_generation(
+    generation_id: str,
+    from_statuses: Sequence[str] = ACTIVE_STATUSES,
+    **values: Any,
+) -> bool:
+    """Write generation fields with a single guarded UPDATE and commit.
+
+    Returns:
+        True if this call updated the row
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(_transition(generation_id, from_statuses, values))
+        await db.commit()
+    return result.rowcount == 1
+
+
+async def _finish_with_usage(
+    generation: Generation,
+    from_statuses: Sequence[str] = ACTIVE_STATUSES,
+    **values: Any,
+) -> bool:
+    """Write a terminal state and add it to the daily usage rollup in one commit.
+
+    Returns:
+        True if this call updated the row
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(_transition(generation.id, from_statuses, values))
+        won = result.rowcount == 1
+        # Only the worker that moved the row counts it, so it's counted once
+        if won:
+            await record_generation(
+                db,
+                provider=generation.provider,
+                model=generation.model,
+                cost=values.get("cost"),
+                time_seconds=values.get("generation_time"),
+                success=values["status"] == GenerationStatus.COMPLETED,
+            )
+        await db.commit()
+    return won
+
+
+async def _fail_generation(
+    generation_id: str,
+    generation: Optional[Generation],
+    error: str,
+    from_statuses: Sequence[str] = ACTIVE_STATUSES,
+) -> None:
+    """Mark a generation failed, counting it in usage once its row is known."""
+    values = {"status": GenerationStatus.FAILED.value, "error_message": error}
+    if generation is None:
+        await _update_generation(generation_id, from_statuses, **values)
+    else:
+        await _finish_with_usage(generation, from_statuses, **values)
+
+
+def webhook_token(generation_id: str) -> str:
+    """Sign a generation ID for its webhook URL, so callbacks can't be forged."""
+    key = get_settings().secret_key.encode()
+    return hmac.new(key, generation_id.encode(), hashlib.sha256).hexdigest()
+
+
+def get_callback_url(provider: VideoProvider, generation_id: str) -> Optional[str]:
+    """Get the webhook URL to register with a provider, if enabled."""
+    settings = get_settings()
+    if not settings.webhook_base_url or not provider.get_supported_features().supports_webhooks:
+        return None
+    return (
+        f"{settings.webhook_base_url.rstrip('/')}/v1/webhooks/{provider.name}/{generation_id}"
+        f"?token={webhook_token(generation_id)}"
+    )
+
+
+async def _process_video_generation(
+    generation_id: str,
+    provider_name: str,
+    api_key_id: int,
+    request: Dict[str, Any],
+):
+    """Run the provider generation and polling loop."""
+    generation = None
+    try:
+        generation = await _get_generation(generation_id)
+        if not generation:
+            return
+        # Tasks are acked late, so a redelivery may find the row finished,
+        # or claimed by the worker that died
+        await _release_stale_claim(generation)
+        if generation.status not in ACTIVE_STATUSES:
+            return
+
+        # Create provider
+        provider, api_key = await _get_provider(provider_name, api_key_id)
+        callback_url = get_callback_url(provider, generation_id)
+
+        if generation.provider_job_id:
+            # Redelivered after the job was submitted: resume polling it
+            # rather than paying for a second provider job
+            job_id = generation.provider_job_id
+            start_time = generation.created_at
+        else:
+            # Generate video
+            video_request = VideoRequest(
+                prompt=request["prompt"],
+                duration=request["duration"],
+                aspect_ratio=request["aspect_ratio"],
+                seed=request["seed"],
+                fps=request["fps"],
+                callback_url=callback_url,
+            )
+
+            start_time = datetime.utcnow()
+            result = await provider.generate_video(video_request)
+
+            if result.status == "failed":
+                await _fail_generation(generation_id, generation, result.error)
+                return
+
+            # Record the provider job and the processing state in one write
+            if not await _update_generation(
+                generation_id,
+                status=GenerationStatus.PROCESSING.value,
+                provider_job_id=result.job_id,
+            ):
+                return
+            job_id = result.job_id
+
+        # Poll for completion with exponential backoff. When a webhook is
+        # registered, polling only acts as a slow safety net and the wait
+        # ends early once the webhook has finished the generation.
+        if callback_url:
+            channel = generation_done_channel(generation_id)
+            initial_delay = POLL_MAX_DELAY
+
+            async def wait(delay: float):
+                await get_cache_service().wait_for_message(channel, delay)
+        else:
+            initial_delay = POLL_INITIAL_DELAY
+            wait = asyncio.sleep
+
+        attempt = 0
+        async for status in provider.poll_status(
+            job_id,
+            initial=initial_delay,
+            factor=POLL_BACKOFF,
+            max_interval=POLL_MAX_DELAY,
+            timeout=POLL_TIMEOUT,
+            wait=wait,
+        ):
+            if callback_url:
+                # The webhook may already have claimed or finished this generation
+                if await _get_generation_status(generation_id) not in ACTIVE_STATUSES:
+                    return
+
+            if status.status in ("completed", "failed"):
+                await _finish_generation(generation, provider_name, api_key, status, start_time)
+                return
+
+            # Transient progress goes to Redis; SQL only sees state transitions
+            attempt += 1
+            await get_cache_service().set(
+                generation_progress_key(generation_id),
+                {
+                    "attempt": attempt,
+                    "provider_status": status.status,
+                    "checked_at": datetime.utcnow().isoformat(),
+                },
+                PROGRESS_TTL,
+            )
+
+        # Timeout
+        await _fail_generation(generation_id, generation, "Generation timeout")
+
+    except Exception as e:
+        await _fail_generation(generation_id, generation, str(e))
+    finally:
+        await get_cache_service().delete(
+            USAGE_STATS_CACHE_KEY, generation_progress_key(generation_id)
+        )
+
+
+async def _finalize_video_generation(generation_id: str, provider_name: str, api_key_id: int):
+    """Fetch the final provider status and finish the generation."""
+    generation = None
+    try:
+        generation = await _get_generation(generation_id)
+        if not generation:
+            return
+        await _release_stale_claim(generation)
+        if generation.status not in ACTIVE_STATUSES or not generation.provider_job_id:
+            return
+
+        # Webhook payloads are untrusted; ask the provider for the real status
+        provider, api_key = await _get_provider(provider_name, api_key_id)
+        status = await provider.check_status(generation.provider_job_id)
+        if status.status in ("completed", "failed"):
+            await _finish_generation(
+                generation, provider_name, api_key, status, generation.created_at
+            )
+            await get_cache_service().publish(generation_done_channel(generation_id))
+
+    except Exception as e:
+        await _fail_generation(generation_id, generation, str(e))
+    finally:
+        await get_cache_service().delete(USAGE_STATS_CACHE_KEY)
+
+
+async def _finish_generation(
+    generation: Generation,
+    provider_name: str,
+    api_key: str,
+    status: VideoResponse,
+    start_time: datetime,
+):
+    """Record a terminal provider status, downloading the video on success."""
+    if status.status == "failed":
+        await _fail_generation(generation.id, generation, status.error)
+        return
+
+    if not status.video_url:
+        await _fail_generation(generation.id, generation, "Provider returned no video URL")
+        return
+
+    # Claim the generation so only one worker downloads; the loser stops here
+    if not await _update_generation(generation.id, status=GenerationStatus.FINALIZING.value):
+        return
+
+    try:
+        await _store_video(generation, provider_name, api_key, status, start_time)
+    except Exception as e:
+        # Past the claim only CLAIMED_STATUSES match, so the callers'
+        # handlers could no longer fail the row
+        get_video_storage().delete_video(f"{generation.id}.mp4")
+        await _fail_generation(generation.id, generation, str(e), CLAIMED_STATUSES)
+
+
+async def _store_video(
+    generation: Generation,
+    provider_name: str,
+    api_key: str,
+    status: VideoResponse,
+    start_time: datetime,
+):
+    """Download a claimed generation's video and record it as completed."""
+    requested_duration = generation.duration
+
+    # Download video
+    storage = get_video_storage()
+    filename = f"{generation.id}.mp4"
+
+    # For OpenAI, we need to pass the Authorization header
+    headers = None
+    if provider_name == "openai":
+        headers = {"Authorization": f"Bearer {api_key}"}
+
+    video_path = await storage.download_video_parallel(
+        status.video_url,
+        filename,
+        headers=headers
+    )
+
+    # Update generation
+    end_time = datetime.utcnow()
+    width = height = None
+    duration_seconds = None
+
+    # Extract metadata if available
+    if status.metadata:
+        match = _SIZE_RE.match(str(status.metadata.get("size", "1280x720")))
+        width, height = (int(match[1]), int(match[2])) if match else (1920, 1080)
+
+        # Get duration from metadata or use requested duration
+        duration_seconds = requested_duration
+        with suppress(TypeError, ValueError):
+            duration_seconds = float(status.metadata.get("seconds", requested_duration))
+
+    # Calculate cost using the cost calculator
+    resolution = f"{width}x{height}" if width else None
+    calculated_cost = calculate_cost(
+        provider=provider_name,
+        model=generation.model,
+        duration_seconds=duration_seconds or requested_duration,
+        resolution=resolution
+    )
+
+    await _finish_with_usage(
+        generation,
+        CLAIMED_STATUSES,
+        status=GenerationStatus.COMPLETED.value,
+        video_url=f"http://localhost:3001{video_path}",
+        video_path=video_path,
+        generation_time=(end_time - start_time).total_seconds(),
+        completed_at=end_time,
+        width=width,
+        height=height,
+        duration_seconds=duration_seconds,
+        cost=calculated_cost,
+    )
@@ -110,7 +110,8 @@ export default function Gallery() {
                 ) : (
                   <div className="w-full aspect-video bg-muted rounded-t-lg flex items-center justify-center">
                     <span className={`text-sm px-3 py-1 rounded ${
-                      generation.status === 'processing' || generation.status === 'queued'
+                      generation.status === 'processing' || generation.status === 'queued' ||
+                      generation.status === 'finalizing'
                         ? 'bg-blue-100 text-blue-800'
                         : 'bg-red-100 text-red-800'
                     }`}>